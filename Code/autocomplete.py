@@ -1,16 +1,66 @@
 #!python
 
+from collections import OrderedDict, namedtuple
+import argparse
+import gzip
+import heapq
+import itertools
+import random
+import string
 import sys
 import time
 
 
+# Number of characters to read from a file at a time when streaming lines
+CHUNK_SIZE = 1 << 20
+
+
 def get_lines(filename='/usr/share/dict/words'):
     """Return a list of strings on separate lines in the given text file with
     any leading and trailing whitespace characters removed from each line."""
-    # Open file and remove whitespace from each line
-    with open(filename) as file:
-        lines = [line.strip() for line in file]
-    return lines
+    # Read all lines from the file into a list
+    return list(iter_lines(filename))
+
+
+def open_text(filename):
+    """Open the given text file for reading, decompressing it on the fly if
+    it is compressed with gzip (detected from its first bytes)."""
+    with open(filename, 'rb') as file:
+        magic = file.read(2)
+    if magic == b'\x1f\x8b':
+        return gzip.open(filename, 'rt')
+    return open(filename)
+
+
+def iter_lines(filename='/usr/share/dict/words', chunk_size=CHUNK_SIZE):
+    """Return a generator of strings on separate lines in the given text file,
+    which may be compressed with gzip, with any leading and trailing
+    whitespace characters removed from each line. The file is read in chunks
+    of the given number of characters, so memory use is bounded by the chunk
+    size no matter how large the file is, and a structure can be built from
+    the lines without first storing them all in a list."""
+    with open_text(filename) as file:
+        # Partial line at the end of the previous chunk
+        remainder = ''
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            lines = (remainder + chunk).split('\n')
+            remainder = lines.pop()
+            for line in lines:
+                yield line.strip()
+        if remainder:
+            yield remainder.strip()
+
+
+def vocabulary_size(structure):
+    """Return the number of vocabulary entries stored in the given structure
+    set up for autocomplete, which is either a list or has a size property."""
+    size = getattr(structure, 'size', None)
+    if size is None:
+        return len(structure)
+    return size
 
 
 def generate_prefixes(vocabulary):
@@ -19,91 +69,473 @@ def generate_prefixes(vocabulary):
     return set(word[:len(word)//2] for word in vocabulary)
 
 
+def generate_vocabulary(size, alphabet=string.ascii_lowercase, min_length=3,
+                        max_length=12, mode_length=None, seed=0):
+    """Return a list of the given number of unique random words made of
+    characters from the given alphabet, with lengths between the given
+    minimum and maximum drawn from a triangular distribution that peaks at the
+    given mode length (halfway between them by default). The same seed always
+    generates the same words in the same order, or raise ValueError if there
+    are fewer possible words than the given size."""
+    capacity = sum(len(alphabet) ** length
+                   for length in range(min_length, max_length + 1))
+    if size > capacity:
+        raise ValueError(f'Cannot generate {size} unique words, only '
+                         f'{capacity} are possible')
+    if mode_length is None:
+        mode_length = (min_length + max_length) / 2
+    rand = random.Random(seed)
+    # Use a dictionary as an ordered set so the order does not depend on
+    # string hashing, which is randomized in each process
+    words = {}
+    while len(words) < size:
+        length = round(rand.triangular(min_length, max_length, mode_length))
+        words[''.join(rand.choices(alphabet, k=length))] = None
+    return list(words)
+
+
+def generate_zipf_prefixes(vocabulary, count, exponent=1.0, min_length=1,
+                           seed=0):
+    """Return a list of the given number of prefix queries of words from the
+    given vocabulary, chosen with a Zipf distribution so the word at rank r
+    (its position in the vocabulary, starting at 1) is queried in proportion
+    to 1 / r ** exponent, as in real traffic where a few popular queries are
+    repeated many times. Each query is a prefix of random length of at least
+    the given minimum length. The same seed always generates the same list."""
+    rand = random.Random(seed)
+    cum_weights = list(itertools.accumulate(
+        1 / rank ** exponent for rank in range(1, len(vocabulary) + 1)))
+    words = rand.choices(vocabulary, cum_weights=cum_weights, k=count)
+    return [word[:rand.randint(min(min_length, len(word)), len(word))]
+            for word in words]
+
+
+# Registry of autocomplete backends by algorithm name, each with a function
+# to set up its structure from a vocabulary and a function to complete a
+# prefix using that structure
+Backend = namedtuple('Backend', ['setup', 'complete', 'key'],
+                     defaults=[None])
+BACKENDS = {}
+
+
+def register_backend(name, setup, complete, key=None):
+    """Register an autocomplete backend under the given algorithm name with
+    the given setup function, which is called with a vocabulary and returns a
+    structure, and complete function, which is called with a prefix and that
+    structure and returns a list of all vocabulary entries with the prefix.
+    If the backend matches prefixes against some other form of each entry,
+    such as a case-folded one, the given key function maps an entry or prefix
+    to that form, and completions are sorted by it."""
+    BACKENDS[name] = Backend(setup, complete, key)
+
+
+def linear_search(prefix, vocabulary):
+    """Return all entries in the given vocabulary list that start with the
+    given prefix using linear search."""
+    return [word for word in vocabulary if word.startswith(prefix)]
+
+
+def complete_structure(prefix, structure):
+    """Return all vocabulary entries that start with the given prefix using
+    the complete method of the given structure."""
+    return structure.complete(prefix)
+
+
+def setup_prefix_tree(vocabulary):
+    """Return a prefix tree structure with the given vocabulary."""
+    from prefixtree import PrefixTree
+    return PrefixTree(vocabulary)
+
+
+def setup_compact_prefix_tree(vocabulary):
+    """Return a compact prefix tree structure with the given vocabulary."""
+    from compactprefixtree import CompactPrefixTree
+    return CompactPrefixTree(vocabulary)
+
+
+def setup_radix_tree(vocabulary):
+    """Return a radix tree structure with the given vocabulary."""
+    from radixtree import RadixTree
+    return RadixTree(vocabulary)
+
+
+def setup_frozen_prefix_tree(vocabulary):
+    """Return a frozen prefix tree structure with the given vocabulary."""
+    from frozenprefixtree import FrozenPrefixTree
+    return FrozenPrefixTree(vocabulary)
+
+
+def setup_ternary_search_tree(vocabulary):
+    """Return a ternary search tree structure with the given vocabulary."""
+    from ternarysearchtree import TernarySearchTree
+    return TernarySearchTree(vocabulary)
+
+
+def setup_normalized_prefix_tree(vocabulary):
+    """Return a case-insensitive prefix tree structure with the given
+    vocabulary, which completes prefixes to the original vocabulary entries."""
+    from normalizedprefixtree import NormalizedPrefixTree
+    return NormalizedPrefixTree(vocabulary)
+
+
+def normalized_key(word):
+    """Return the key that a case-insensitive prefix tree matches the given
+    vocabulary entry or prefix against."""
+    from normalizedprefixtree import normalize
+    return normalize(word)
+
+
+def setup_bytes_prefix_tree(vocabulary):
+    """Return a byte-level prefix tree structure with the given vocabulary."""
+    from bytesprefixtree import BytesPrefixTree
+    return BytesPrefixTree(vocabulary)
+
+
+def setup_mapped_prefix_tree(vocabulary):
+    """Return a memory-mapped prefix tree structure with the given vocabulary,
+    saved to a temporary file that is removed once it is mapped. To skip
+    setup entirely, open a file already written by mappedprefixtree.save with
+    open_mapped_prefix_tree instead."""
+    from mappedprefixtree import save
+    from prefixtree import PrefixTree
+    import os
+    import tempfile
+    descriptor, filename = tempfile.mkstemp(suffix='.ptre')
+    os.close(descriptor)
+    try:
+        save(PrefixTree(vocabulary), filename)
+        return open_mapped_prefix_tree(filename)
+    finally:
+        os.remove(filename)
+
+
+def open_mapped_prefix_tree(filename):
+    """Return a memory-mapped prefix tree structure that answers completions
+    from the given file written by mappedprefixtree.save, for the
+    mapped_prefix_tree algorithm. Opening takes constant time, however many
+    words the file stores."""
+    from mappedprefixtree import MappedPrefixTree
+    return MappedPrefixTree(filename)
+
+
+def setup_sorted_array(vocabulary):
+    """Return a sorted array structure with the given vocabulary."""
+    from sortedarray import SortedArray
+    return SortedArray(vocabulary)
+
+
+register_backend('linear_search', list, linear_search)
+register_backend('sorted_array', setup_sorted_array, complete_structure)
+register_backend('prefix_tree', setup_prefix_tree, complete_structure)
+# The trie algorithm name is kept as an alias for the prefix tree
+register_backend('trie', setup_prefix_tree, complete_structure)
+register_backend('compact_prefix_tree', setup_compact_prefix_tree,
+                 complete_structure)
+register_backend('radix_tree', setup_radix_tree, complete_structure)
+register_backend('frozen_prefix_tree', setup_frozen_prefix_tree,
+                 complete_structure)
+register_backend('ternary_search_tree', setup_ternary_search_tree,
+                 complete_structure)
+register_backend('normalized_prefix_tree', setup_normalized_prefix_tree,
+                 complete_structure, normalized_key)
+register_backend('bytes_prefix_tree', setup_bytes_prefix_tree,
+                 complete_structure)
+register_backend('mapped_prefix_tree', setup_mapped_prefix_tree,
+                 complete_structure)
+
+
+def get_backend(algorithm):
+    """Return the registered backend for the given algorithm name, or raise
+    ValueError if no backend is registered under that name."""
+    if algorithm not in BACKENDS:
+        raise ValueError(f'Unknown algorithm: {algorithm!r}, choose from '
+                         f'{", ".join(sorted(BACKENDS))}')
+    return BACKENDS[algorithm]
+
+
 def autocomplete_setup(vocabulary, algorithm='linear_search'):
     """Return the main data structure needed to set up autocomplete using the
     given vocabulary and algorithm, specified as linear_search, trie, etc."""
-    if algorithm == 'linear_search':
-        # Use the given vocabulary list
-        return vocabulary
-    elif algorithm == 'trie':
-        from trie import Trie
-        # Create a trie structure with the vocabulary
-        return Trie(vocabulary)
+    return get_backend(algorithm).setup(vocabulary)
 
 
-def autocomplete(prefix, structure, algorithm='linear_search'):
+def autocomplete(prefix, structure, algorithm='linear_search', limit=None):
     """Return all vocabulary entries that start with the given prefix using the
-    given structure and algorithm, specified as linear_search, trie, etc."""
-    if algorithm == 'linear_search':
-        # Search the list using linear search
-        return [word for word in structure if word.startswith(prefix)]
-    elif algorithm == 'trie':
-        # Search the trie structure for the prefix
-        return structure.search(prefix)
+    given structure and algorithm, specified as linear_search, trie, etc., or
+    if a limit is given, a list of only the first limit of them in sorted
+    order (by the backend's key, if it has one). Structures with an
+    iter_complete method, like PrefixTree, generate completions in sorted
+    order so the search stops after the limit."""
+    backend = get_backend(algorithm)
+    if limit is None:
+        return backend.complete(prefix, structure)
+    iter_complete = getattr(structure, 'iter_complete', None)
+    if iter_complete is not None:
+        return list(itertools.islice(iter_complete(prefix), limit))
+    return heapq.nsmallest(limit, backend.complete(prefix, structure),
+                           key=backend.key)
+
+
+class CompletionCache:
+    """CompletionCache: A bounded cache of recent autocomplete results in
+    front of a structure set up for autocomplete, keyed by prefix and limit.
+    Repeated prefixes are answered without searching the structure again,
+    which pays off when a few short prefixes make up most of the queries.
+    When the cache holds more than the maximum number of entries or its
+    estimated memory use exceeds the maximum number of bytes, the least
+    recently used entries are evicted first. Structures with a version
+    property, such as PrefixTree, are checked on every lookup and the cache
+    is cleared if they were modified; call clear after modifying any other
+    structure."""
+
+    def __init__(self, structure, algorithm='prefix_tree', max_entries=1024,
+                 max_bytes=None):
+        """Initialize this cache of completions found using the given
+        structure and algorithm with the given maximum number of entries and
+        maximum estimated memory use in bytes, or no maximum if None."""
+        if max_entries is not None and max_entries < 0:
+            raise ValueError(f'Invalid max_entries: {max_entries!r}')
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f'Invalid max_bytes: {max_bytes!r}')
+        # Check the algorithm now rather than on the first lookup
+        get_backend(algorithm)
+        self.structure = structure
+        self.algorithm = algorithm
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Map of (prefix, limit) keys to (completions, bytes) pairs, ordered
+        # from least to most recently used
+        self.entries = OrderedDict()
+        # Estimated memory use of all entries in bytes
+        self.num_bytes = 0
+        # Count lookups found in the cache, not found, and entries evicted
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Version of the structure that the cached completions came from
+        self.version = getattr(structure, 'version', None)
+
+    def __len__(self) -> int:
+        """Return the number of entries in this cache."""
+        return len(self.entries)
+
+    def __repr__(self):
+        """Return a string representation of this cache."""
+        return (f'CompletionCache({len(self)} entries, {self.num_bytes} '
+                f'bytes, {self.hits} hits, {self.misses} misses)')
+
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups that were found in this cache."""
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def clear(self):
+        """Remove all entries from this cache, keeping its counters."""
+        self.entries.clear()
+        self.num_bytes = 0
+
+    def complete(self, prefix, limit=None) -> [str]:
+        """Return a list of vocabulary entries that start with the given
+        prefix, or only the first limit of them in sorted order if a limit is
+        given (see autocomplete), from this cache if possible or else from
+        the structure."""
+        version = getattr(self.structure, 'version', None)
+        # case: structure was modified since completions were cached
+        if version != self.version:
+            self.clear()
+            self.version = version
+        key = (prefix, limit)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            # Copy so that callers cannot modify the cached completions
+            return list(entry[0])
+        self.misses += 1
+        completions = autocomplete(prefix, self.structure, self.algorithm,
+                                   limit)
+        # Cache a tuple and return a list, whatever type the backend returned
+        completions = tuple(completions)
+        self._add(key, completions)
+        return list(completions)
+
+    def _add(self, key, completions):
+        """Add the given completions to this cache under the given key and
+        evict the least recently used entries until it is within bounds."""
+        num_bytes = _entry_size(key, completions)
+        # case: entry could never fit, so do not evict everything for it
+        if self.max_bytes is not None and num_bytes > self.max_bytes:
+            return
+        self.entries[key] = (completions, num_bytes)
+        self.num_bytes += num_bytes
+        while ((self.max_entries is not None and
+                len(self.entries) > self.max_entries) or
+               (self.max_bytes is not None and
+                self.num_bytes > self.max_bytes)):
+            _, (_, evicted_bytes) = self.entries.popitem(last=False)
+            self.num_bytes -= evicted_bytes
+            self.evictions += 1
+
+
+def _entry_size(key, completions) -> int:
+    """Return the estimated number of bytes used by a cache entry with the
+    given key and tuple of completions, including the strings in both."""
+    prefix, _ = key
+    return (sys.getsizeof(key) + sys.getsizeof(prefix) +
+            sys.getsizeof(completions) +
+            sum(sys.getsizeof(completion) for completion in completions))
 
 
 def main():
     """Read command-line arguments and test autocomplete algorithms."""
-    if len(sys.argv) == 1:
-        script = sys.argv[0]  # Get script file name
-        print('Usage: {} prefix'.format(script))
+    parser = argparse.ArgumentParser(
+        description='Test autocomplete with the given prefix and dictionary '
+                    'words, or with the given prefixes and vocabulary files')
+    parser.add_argument('arguments', nargs='*',
+                        metavar='prefix | prefixes-file vocabulary-file')
+    parser.add_argument('-a', '--algorithm', choices=sorted(BACKENDS),
+                        help='autocomplete backend to use (default: '
+                             'prefix_tree, or every backend to benchmark)')
+    parser.add_argument('-b', '--benchmark', action='store_true',
+                        help='report setup time, peak memory and latency '
+                             'percentiles of each prefix')
+    parser.add_argument('--trials', type=int, default=5,
+                        help='timed runs of all prefixes to benchmark')
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='untimed runs of all prefixes to benchmark')
+    parser.add_argument('--json', action='store_true',
+                        help='print benchmark results as JSON')
+    parser.add_argument('-s', '--synthetic', type=int, metavar='SIZE',
+                        help='generate a vocabulary of this many random words '
+                             'and Zipf-distributed prefixes instead of files')
+    parser.add_argument('--queries', type=int, default=10000,
+                        help='number of synthetic prefixes to generate')
+    parser.add_argument('--zipf-exponent', type=float, default=1.0,
+                        help='skew of synthetic prefix popularity')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='random seed for the synthetic workload')
+    parser.add_argument('-c', '--cache', type=int, metavar='ENTRIES',
+                        help='cache this many recent completions in front of '
+                             'the backend when testing many prefixes')
+    parser.add_argument('-m', '--mapped', action='store_true',
+                        help='open the vocabulary file as a prefix tree file '
+                             'written by mappedprefixtree.save instead of '
+                             'setting up a backend from its words')
+    args = parser.parse_args()
+    algorithm = args.algorithm or 'prefix_tree'
+    if args.mapped:
+        if len(args.arguments) != 2 or args.synthetic is not None or \
+                args.benchmark:
+            parser.error('--mapped needs a prefixes file and a prefix tree '
+                         'file')
+        algorithm = 'mapped_prefix_tree'
+
+    if args.synthetic is None and not 1 <= len(args.arguments) <= 2:
+        script = parser.prog  # Get script file name
+        print('Usage: {} [-a algorithm] prefix'.format(script))
         print('Test autocomplete with dictionary words and the given prefix')
         print('Example: {} axl'.format(script))
         print('Completions of axl: axle, axled, axlesmith, axletree')
         print()
-        print('Usage: {} prefixes-file vocabulary-file'.format(script))
+        print('Usage: {} [-a algorithm] prefixes-file vocabulary-file'
+              .format(script))
         print('Test autocomplete with the given prefixes and vocabulary files')
         print('Example: {} prefixes.txt /usr/share/dict/words'.format(script))
+        print()
+        print('Usage: {} [-a algorithm] --synthetic size'.format(script))
+        print('Test autocomplete with a generated vocabulary and prefixes')
+        print()
+        print('Usage: {} --mapped prefixes-file prefix-tree-file'
+              .format(script))
+        print('Test autocomplete with a file written by mappedprefixtree.py')
+        print()
+        print('Usage: {} --benchmark [--json] prefixes-file vocabulary-file'
+              .format(script))
+        print('Report setup time, memory and latency percentiles of backends')
+        print()
+        print('Algorithms: {}'.format(', '.join(sorted(BACKENDS))))
         return
 
-    elif len(sys.argv) == 2:
+    if args.synthetic is not None:
+        # Generate a seeded vocabulary and prefix queries of its words
+        vocabulary = generate_vocabulary(args.synthetic, seed=args.seed)
+        prefixes = generate_zipf_prefixes(vocabulary, args.queries,
+                                          args.zipf_exponent, seed=args.seed)
+    elif len(args.arguments) == 1:
+        # Stream dictionary words into setup and use the given prefix
+        prefixes = args.arguments
+        vocabulary = iter_lines('/usr/share/dict/words')
+    else:
+        # Stream the given vocabulary file into setup and read the prefixes
+        vocabulary = iter_lines(args.arguments[1])
+        prefixes = get_lines(args.arguments[0])
+
+    if args.benchmark:
+        from autocomplete_benchmark import benchmark, print_results
+        # Every backend is set up from the same vocabulary so keep it all
+        vocabulary = list(vocabulary)
+        algorithms = [args.algorithm] if args.algorithm else None
+        results = benchmark(vocabulary, prefixes, algorithms, args.trials,
+                            args.warmup)
+        print_results(results, args.json)
+
+    elif args.synthetic is None and len(args.arguments) == 1:
         # Test autocomplete with dictionary words and the given prefix
-        prefix = sys.argv[1]
-        vocabulary = get_lines('/usr/share/dict/words')
+        prefix = prefixes[0]
 
-        # Start the clock for benchmarking
+        # Start the clock for benchmarking, including reading the vocabulary
         start_time = time.time()
 
         # Set up autocomplete and mark the clock
-        structure = autocomplete_setup(vocabulary)
+        structure = autocomplete_setup(vocabulary, algorithm)
         setup_time = time.time()
 
         # Run autocomplete and mark the clock
-        completions = autocomplete(prefix, structure)
+        completions = autocomplete(prefix, structure, algorithm)
         end_time = time.time()
 
-        print('Vocabulary size: {}'.format(len(vocabulary)))
+        print('Vocabulary size: {}'.format(vocabulary_size(structure)))
         print('Completions of {}: {}'.format(prefix, ', '.join(completions)))
         print()
         print('Initial setup time: {:.6f} sec'.format(setup_time - start_time))
         print('Autocomplete time:  {:.6f} sec'.format(end_time - setup_time))
         print('Total time elapsed: {:.6f} sec'.format(end_time - start_time))
 
-    elif len(sys.argv) == 3:
-        # Open the given vocabulary and prefixes files
-        vocabulary = get_lines(sys.argv[2])
-        prefixes = get_lines(sys.argv[1])
-
-        # Start the clock for benchmarking
+    else:
+        # Start the clock for benchmarking, including reading the vocabulary
         start_time = time.time()
 
-        # Set up autocomplete and mark the clock
-        structure = autocomplete_setup(vocabulary)
+        # Set up autocomplete, or open a saved structure, and mark the clock
+        if args.mapped:
+            structure = open_mapped_prefix_tree(args.arguments[1])
+        else:
+            structure = autocomplete_setup(vocabulary, algorithm)
         setup_time = time.time()
 
-        # Run autocomplete with each prefix
+        # Run autocomplete with each prefix, through a cache if requested
+        cache = None
+        if args.cache is not None:
+            cache = CompletionCache(structure, algorithm, args.cache)
         num_completions = 0
         for prefix in prefixes:
-            completions = autocomplete(prefix, structure)
+            if cache is not None:
+                completions = cache.complete(prefix)
+            else:
+                completions = autocomplete(prefix, structure, algorithm)
             num_completions += len(completions)
             # print('Completions of {}: {}'.format(prefix, ', '.join(completions)))
 
         # Mark the clock
         end_time = time.time()
 
-        print('Vocabulary size: {}'.format(len(vocabulary)))
+        print('Vocabulary size: {}'.format(vocabulary_size(structure)))
         print('Found {} total completions of {} prefixes'
               .format(num_completions, len(prefixes)))
+        if cache is not None:
+            print('Cache hits: {}, misses: {}, hit rate: {:.1%}'
+                  .format(cache.hits, cache.misses, cache.hit_rate()))
         print()
         print('Initial setup time: {:.6f} sec'.format(setup_time - start_time))
         print('Autocomplete time:  {:.6f} sec'.format(end_time - setup_time))
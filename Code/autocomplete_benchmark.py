@@ -0,0 +1,113 @@
+#!python
+
+from autocomplete import BACKENDS, autocomplete, autocomplete_setup
+import json
+import statistics
+import time
+import tracemalloc
+
+# Percentiles of per-prefix latency to report for each backend
+PERCENTILES = [50, 90, 99]
+
+
+def percentile(sorted_values, percent):
+    """Return the given percentile of the given sorted list of values using
+    the nearest-rank method, so the result is always one of the values."""
+    if len(sorted_values) == 0:
+        raise ValueError('Cannot take percentile of no values')
+    # Smallest value such that at least the given percent of values are <= it
+    rank = max(1, -(-percent * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+def measure_setup(vocabulary, algorithm):
+    """Return a tuple of the structure set up for the given vocabulary and
+    algorithm, the setup time in nanoseconds, and the peak memory in bytes
+    allocated during setup. Setup runs twice so that tracing allocations to
+    measure memory does not slow down the timed run."""
+    start_time = time.perf_counter_ns()
+    structure = autocomplete_setup(vocabulary, algorithm)
+    setup_ns = time.perf_counter_ns() - start_time
+    del structure
+    tracemalloc.start()
+    try:
+        structure = autocomplete_setup(vocabulary, algorithm)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return structure, setup_ns, peak_memory
+
+
+def benchmark_backend(vocabulary, prefixes, algorithm, trials=5, warmup=1):
+    """Return a dictionary of benchmark results for the given algorithm with
+    the given vocabulary and prefixes, including setup time, peak setup memory
+    and percentiles of the latency of each autocomplete call over the given
+    number of trials, after the given number of untimed warmup runs."""
+    structure, setup_ns, peak_memory = measure_setup(vocabulary, algorithm)
+    # Warm up caches and lazily created state before timing anything
+    for _ in range(warmup):
+        for prefix in prefixes:
+            autocomplete(prefix, structure, algorithm)
+    latencies = []
+    num_completions = 0
+    for _ in range(trials):
+        for prefix in prefixes:
+            start_time = time.perf_counter_ns()
+            completions = autocomplete(prefix, structure, algorithm)
+            latencies.append(time.perf_counter_ns() - start_time)
+            num_completions += len(completions)
+    latencies.sort()
+    latency = {}
+    if latencies:
+        latency['min'] = latencies[0]
+        latency['mean'] = statistics.fmean(latencies)
+        latency['stdev'] = statistics.pstdev(latencies)
+        for percent in PERCENTILES:
+            latency[f'p{percent}'] = percentile(latencies, percent)
+        latency['max'] = latencies[-1]
+    return {
+        'algorithm': algorithm,
+        'vocabulary_size': len(vocabulary),
+        'num_prefixes': len(prefixes),
+        'trials': trials,
+        'warmup': warmup,
+        'num_completions': num_completions // max(trials, 1),
+        'setup_ns': setup_ns,
+        'peak_setup_memory_bytes': peak_memory,
+        'latency_ns': latency,
+        'total_ns': sum(latencies),
+    }
+
+
+def benchmark(vocabulary, prefixes, algorithms=None, trials=5, warmup=1):
+    """Return a list of benchmark results for each of the given algorithms,
+    or for every registered backend if none are given, skipping any names
+    registered as aliases of the same backend."""
+    if algorithms is None:
+        algorithms = []
+        for algorithm in sorted(BACKENDS):
+            if all(BACKENDS[name] != BACKENDS[algorithm]
+                   for name in algorithms):
+                algorithms.append(algorithm)
+    return [benchmark_backend(vocabulary, prefixes, algorithm, trials, warmup)
+            for algorithm in algorithms]
+
+
+def print_results(results, as_json=False):
+    """Print the given benchmark results as a table, or as JSON if as_json is
+    True so that results can be compared across releases by other tools."""
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+    header = ['algorithm', 'setup ms', 'memory MiB'] + \
+        [f'p{percent} us' for percent in PERCENTILES] + ['max us']
+    print('{:>20} {:>10} {:>10} '.format(*header[:3]) +
+          ' '.join('{:>10}'.format(column) for column in header[3:]))
+    for result in results:
+        latency = result['latency_ns']
+        columns = [latency.get(f'p{percent}', 0) for percent in PERCENTILES]
+        columns.append(latency.get('max', 0))
+        print('{:>20} {:>10.3f} {:>10.2f} '.format(
+                  result['algorithm'], result['setup_ns'] / 1e6,
+                  result['peak_setup_memory_bytes'] / 2**20) +
+              ' '.join('{:>10.1f}'.format(column / 1e3) for column in columns))
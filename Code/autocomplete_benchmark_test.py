@@ -0,0 +1,46 @@
+#!python
+
+from autocomplete_benchmark import benchmark, benchmark_backend, percentile
+import unittest
+
+
+class AutocompleteBenchmarkTest(unittest.TestCase):
+
+    vocabulary = ['axle', 'axled', 'axlesmith', 'axletree', 'apple', 'math']
+    prefixes = ['axl', 'ma', 'b']
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 90) == 90
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([7], 50) == 7
+        assert percentile([1, 2, 3], 50) == 2
+        assert percentile([1, 2, 3], 0) == 1
+        with self.assertRaises(ValueError):
+            percentile([], 50)
+
+    def test_benchmark_backend(self):
+        result = benchmark_backend(self.vocabulary, self.prefixes,
+                                   'prefix_tree', trials=3, warmup=1)
+        assert result['algorithm'] == 'prefix_tree'
+        assert result['vocabulary_size'] == 6
+        assert result['num_prefixes'] == 3
+        assert result['num_completions'] == 5
+        assert result['setup_ns'] > 0
+        assert result['peak_setup_memory_bytes'] > 0
+        latency = result['latency_ns']
+        assert latency['min'] <= latency['p50'] <= latency['p90'] \
+            <= latency['p99'] <= latency['max']
+
+    def test_benchmark_skips_aliases(self):
+        results = benchmark(self.vocabulary, self.prefixes, trials=1)
+        algorithms = [result['algorithm'] for result in results]
+        assert 'prefix_tree' in algorithms
+        assert 'trie' not in algorithms
+        assert 'linear_search' in algorithms
+
+
+if __name__ == '__main__':
+    unittest.main()
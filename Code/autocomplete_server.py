@@ -0,0 +1,506 @@
+#!python3
+
+from autocomplete import (BACKENDS, CompletionCache, autocomplete,
+                          autocomplete_setup, generate_vocabulary,
+                          generate_zipf_prefixes, get_lines, iter_lines,
+                          open_mapped_prefix_tree, vocabulary_size)
+from autocomplete_benchmark import PERCENTILES, percentile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+
+# Maximum number of requests read from one connection but not yet answered,
+# after which the server stops reading until responses have been sent
+MAX_PIPELINE = 1024
+# Maximum length in bytes of one request line
+MAX_LINE = 1 << 16
+
+# Structure set up for autocomplete in a shard worker process, with the
+# algorithm it was set up with and a completion cache in front of it, if any
+_shard_structure = None
+_shard_algorithm = None
+_shard_cache = None
+
+
+def shard_index(word: str, num_shards: int, key=None) -> int:
+    """Return the index of the shard that stores the given word, or answers
+    completions of the given non-empty prefix, by its first character, or by
+    the first character of its key if a backend's key function is given."""
+    if key is not None:
+        word = key(word)
+    if len(word) == 0:
+        return 0
+    return ord(word[0]) % num_shards
+
+
+def partition(vocabulary, num_shards: int, key=None) -> [[str]]:
+    """Return a list of the given number of lists of words from the given
+    vocabulary, with each word in the list of the shard that stores it, by
+    the given key function if not None (see shard_index)."""
+    shards = [[] for _ in range(num_shards)]
+    for word in vocabulary:
+        shards[shard_index(word, num_shards, key)].append(word)
+    return shards
+
+
+def _setup_shard(vocabulary, algorithm, cache_entries):
+    """Set up the structure for the given shard of the vocabulary with the
+    given algorithm once when a shard worker process starts, with a cache of
+    the given number of recent completions in front of it if not None."""
+    _use_shard(autocomplete_setup(vocabulary, algorithm), algorithm,
+               cache_entries)
+
+
+def _open_mapped_shard(filename, cache_entries):
+    """Map the given prefix tree file written by mappedprefixtree.save once
+    when a shard worker process starts, with a cache of the given number of
+    recent completions in front of it if not None."""
+    _use_shard(open_mapped_prefix_tree(filename), 'mapped_prefix_tree',
+               cache_entries)
+
+
+def _use_shard(structure, algorithm, cache_entries):
+    """Answer completions in this worker process with the given structure
+    set up for the given algorithm, through a cache of the given number of
+    recent completions if not None."""
+    global _shard_structure, _shard_algorithm, _shard_cache
+    _shard_structure = structure
+    _shard_algorithm = algorithm
+    _shard_cache = None
+    if cache_entries is not None:
+        _shard_cache = CompletionCache(structure, algorithm, cache_entries)
+
+
+def _shard_size() -> int:
+    """Return the number of words stored in this worker process's shard."""
+    return vocabulary_size(_shard_structure)
+
+
+def _complete_in_shard(prefix: str, limit) -> [str]:
+    """Return a list of words in this worker process's shard that start with
+    the given prefix, or only the first limit of them in sorted order if a
+    limit is given (see autocomplete)."""
+    if _shard_cache is not None:
+        return _shard_cache.complete(prefix, limit)
+    # Copy into a list since views like SortedArrayView would be sent back
+    # to the server process together with the whole list they view
+    return list(autocomplete(prefix, _shard_structure, _shard_algorithm,
+                             limit))
+
+
+class AutocompleteServer:
+    """AutocompleteServer: A long-running server that sets up autocomplete
+    once and answers completion requests over a Unix socket or TCP. The
+    vocabulary is split into shards by the first character of each word and
+    each shard is set up in its own worker process, so requests for prefixes
+    in different shards are answered in parallel on separate cores.
+
+    The protocol is one JSON object per line in each direction. A request
+    has a prefix and optionally a limit and an id, such as
+    {"id": 1, "prefix": "axl", "limit": 10}, and its response has the same id
+    and either a list of completions or an error message, such as
+    {"id": 1, "completions": ["axle", "axled"]}. Clients may pipeline many
+    requests on a connection without waiting, and responses are always sent
+    in the same order as the requests.
+
+    A server can instead answer completions from a prefix tree file written
+    by mappedprefixtree.save (see from_mapped_file). Every worker process
+    then maps the whole file, which takes constant time and shares its pages
+    between processes, so workers start at once without building anything.
+    Prefixes are still spread over workers by first character."""
+
+    def __init__(self, vocabulary, algorithm='prefix_tree', num_shards=None,
+                 cache_entries=None, mapped_file=None):
+        """Initialize this server to answer completions of the given
+        vocabulary using the given algorithm in the given number of shard
+        worker processes, or one per CPU if None, each with a cache of the
+        given number of recent completions if not None. If a mapped file is
+        given, the vocabulary must be None, the algorithm mapped_prefix_tree
+        and every worker answers from that prefix tree file instead (see
+        from_mapped_file)."""
+        if algorithm not in BACKENDS:
+            raise ValueError(f'Unknown algorithm: {algorithm!r}')
+        if num_shards is None:
+            num_shards = os.cpu_count() or 1
+        if num_shards < 1:
+            raise ValueError(f'Invalid number of shards: {num_shards!r}')
+        if (mapped_file is None) == (vocabulary is None):
+            raise ValueError('Give either a vocabulary or a mapped file')
+        if mapped_file is not None and algorithm != 'mapped_prefix_tree':
+            raise ValueError('Mapped files need the mapped_prefix_tree '
+                             'algorithm')
+        self.num_shards = num_shards
+        # Words and prefixes are sharded by the backend's key, if it has one,
+        # so that all entries a prefix can match are in the same shard
+        self.key = BACKENDS[algorithm].key
+        # Marks if every shard stores the whole vocabulary from a mapped file
+        self.replicated = mapped_file is not None
+        # One single-process pool per shard, so each request for a shard is
+        # answered by the process that has its structure set up
+        if self.replicated:
+            self.shards = [ProcessPoolExecutor(
+                               1, initializer=_open_mapped_shard,
+                               initargs=(mapped_file, cache_entries))
+                           for _ in range(num_shards)]
+        else:
+            self.shards = [ProcessPoolExecutor(
+                               1, initializer=_setup_shard,
+                               initargs=(words, algorithm, cache_entries))
+                           for words in partition(vocabulary, num_shards,
+                                                  self.key)]
+        # Count the number of words stored in all shards, once set up
+        self.size = 0
+        self.server = None
+
+    @classmethod
+    def from_mapped_file(cls, filename, num_shards=None, cache_entries=None):
+        """Return a new server that answers completions from the given prefix
+        tree file written by mappedprefixtree.save, mapped by each of the
+        given number of worker processes, or one per CPU if None, each with a
+        cache of the given number of recent completions if not None."""
+        return cls(None, 'mapped_prefix_tree', num_shards, cache_entries,
+                   filename)
+
+    def __repr__(self):
+        """Return a string representation of this server."""
+        return (f'AutocompleteServer({self.size} words, '
+                f'{self.num_shards} shards)')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self, path=None, host='127.0.0.1', port=0):
+        """Set up every shard, then start listening for connections on the
+        Unix socket at the given path, or on the given TCP host and port if
+        no path is given, and return the address listened on."""
+        loop = asyncio.get_running_loop()
+        # Worker processes start lazily, so make each one set up its shard
+        # before accepting any connections
+        sizes = await asyncio.gather(*(loop.run_in_executor(shard, _shard_size)
+                                       for shard in self.shards))
+        self.size = sizes[0] if self.replicated else sum(sizes)
+        if path is not None:
+            self.server = await asyncio.start_unix_server(
+                self._handle_connection, path, limit=MAX_LINE)
+        else:
+            self.server = await asyncio.start_server(
+                self._handle_connection, host, port, limit=MAX_LINE)
+        return self.server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        """Answer requests until this server is closed or cancelled."""
+        await self.server.serve_forever()
+
+    async def close(self):
+        """Stop listening for connections and shut down the shard workers."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for shard in self.shards:
+            shard.shutdown(cancel_futures=True)
+
+    async def complete(self, prefix: str, limit=None) -> [str]:
+        """Return a list of vocabulary words that start with the given
+        prefix, or only the first limit of them in sorted order if a limit is
+        given, from the shard that stores them, or from every shard for the
+        empty prefix unless every shard stores the whole vocabulary."""
+        loop = asyncio.get_running_loop()
+        if len(prefix) == 0 and not self.replicated:
+            shards = self.shards
+        else:
+            shards = [self.shards[shard_index(prefix, self.num_shards,
+                                              self.key)]]
+        results = await asyncio.gather(*(
+            loop.run_in_executor(shard, _complete_in_shard, prefix, limit)
+            for shard in shards))
+        if limit is None:
+            return [word for result in results for word in result]
+        # Each shard's limited completions are sorted, so merge them to find
+        # the first limit of all of them
+        return list(itertools.islice(heapq.merge(*results, key=self.key),
+                                     limit))
+
+    async def _respond(self, line: bytes) -> bytes:
+        """Return the encoded response line to the given request line."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('Request must be a JSON object')
+            request_id = request.get('id')
+            prefix = request.get('prefix')
+            limit = request.get('limit')
+            if not isinstance(prefix, str):
+                raise ValueError('Request prefix must be a string')
+            # case: bool is a subclass of int, but not a valid limit
+            if limit is not None and (not isinstance(limit, int) or
+                                      isinstance(limit, bool) or limit < 0):
+                raise ValueError(
+                    'Request limit must be a non-negative integer')
+            response = {'id': request_id,
+                        'completions': await self.complete(prefix, limit)}
+        except ValueError as error:
+            response = {'id': request_id, 'error': str(error)}
+        except Exception as error:
+            # case: request too deeply nested to decode or a shard failed, so
+            # answer it with an error to keep serving the connection
+            response = {'id': request_id,
+                        'error': f'{type(error).__name__}: {error}'}
+        return json.dumps(response).encode('utf-8') + b'\n'
+
+    async def _handle_connection(self, reader, writer):
+        """Answer each request line read from the given connection as soon as
+        it arrives, without waiting for earlier requests to be answered, and
+        send responses in request order as they are ready."""
+        # Queue of tasks answering requests in the order they were read
+        pending = asyncio.Queue(MAX_PIPELINE)
+        sender = asyncio.create_task(self._send_responses(pending, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                await pending.put(asyncio.create_task(self._respond(line)))
+        except (ConnectionError, ValueError):
+            # case: client disconnected or sent a line that is too long
+            pass
+        finally:
+            await pending.put(None)
+            try:
+                await sender
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def _send_responses(self, pending, writer):
+        """Write the response of each task from the given queue to the given
+        connection in order until the queue yields None."""
+        connected = True
+        while True:
+            task = await pending.get()
+            if task is None:
+                return
+            response = await task
+            if not connected:
+                continue
+            try:
+                writer.write(response)
+                await writer.drain()
+            except ConnectionError:
+                # Keep taking tasks so the reader is never blocked on a full
+                # queue, but stop writing to the closed connection
+                connected = False
+
+
+async def open_connection(path=None, host='127.0.0.1', port=None):
+    """Return a (reader, writer) pair for a connection to the autocomplete
+    server at the given Unix socket path, or else TCP host and port."""
+    if path is not None:
+        return await asyncio.open_unix_connection(path, limit=MAX_LINE)
+    return await asyncio.open_connection(host, port, limit=MAX_LINE)
+
+
+async def load_test(prefixes, path=None, host='127.0.0.1', port=None,
+                    connections=4, pipeline=16, limit=None) -> dict:
+    """Send a request for each of the given prefixes to the autocomplete
+    server at the given address, spread over the given number of concurrent
+    connections with up to the given number of requests pipelined on each,
+    and return a dictionary of the throughput and latency percentiles."""
+    if connections < 1 or pipeline < 1:
+        raise ValueError('Connections and pipeline depth must be positive')
+    latencies = []
+    num_completions = 0
+    num_errors = 0
+
+    async def run_connection(connection_prefixes):
+        """Send requests for the given prefixes on one connection while
+        reading their responses, with a bounded number in flight."""
+        reader, writer = await open_connection(path, host, port)
+        window = asyncio.Semaphore(pipeline)
+        # Send times of requests whose responses have not been read yet
+        send_times = deque()
+
+        async def send():
+            for request_id, prefix in enumerate(connection_prefixes):
+                await window.acquire()
+                request = {'id': request_id, 'prefix': prefix}
+                if limit is not None:
+                    request['limit'] = limit
+                send_times.append(time.perf_counter_ns())
+                writer.write(json.dumps(request).encode('utf-8') + b'\n')
+                await writer.drain()
+
+        async def receive():
+            nonlocal num_completions, num_errors
+            for request_id in range(len(connection_prefixes)):
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError('Server closed the connection')
+                latencies.append(time.perf_counter_ns() - send_times.popleft())
+                window.release()
+                response = json.loads(line)
+                if response['id'] != request_id:
+                    raise RuntimeError(f'Response {response["id"]} out of '
+                                       f'order, expected {request_id}')
+                if 'error' in response:
+                    num_errors += 1
+                else:
+                    num_completions += len(response['completions'])
+
+        try:
+            await asyncio.gather(send(), receive())
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start_time = time.perf_counter_ns()
+    await asyncio.gather(*(run_connection(prefixes[index::connections])
+                           for index in range(connections)))
+    total_ns = time.perf_counter_ns() - start_time
+
+    latencies.sort()
+    latency = {}
+    if latencies:
+        latency['min'] = latencies[0]
+        for percent in PERCENTILES:
+            latency[f'p{percent}'] = percentile(latencies, percent)
+        latency['max'] = latencies[-1]
+    return {
+        'num_requests': len(latencies),
+        'num_completions': num_completions,
+        'num_errors': num_errors,
+        'connections': connections,
+        'pipeline': pipeline,
+        'total_ns': total_ns,
+        'requests_per_sec': len(latencies) / (total_ns / 1e9),
+        'latency_ns': latency,
+    }
+
+
+def print_load_test(result, as_json=False):
+    """Print the given load test result, or as JSON if as_json is True."""
+    if as_json:
+        print(json.dumps(result, indent=2))
+        return
+    print('Requests: {} ({} errors) over {} connections, pipeline depth {}'
+          .format(result['num_requests'], result['num_errors'],
+                  result['connections'], result['pipeline']))
+    print('Completions: {}'.format(result['num_completions']))
+    print('Total time: {:.6f} sec'.format(result['total_ns'] / 1e9))
+    print('Throughput: {:.1f} requests/sec'.format(result['requests_per_sec']))
+    latency = result['latency_ns']
+    print('Latency: ' + ', '.join('{} {:.1f} us'.format(name, value / 1e3)
+                                  for name, value in latency.items()))
+
+
+async def serve(args):
+    """Load the vocabulary and answer requests until interrupted."""
+    if args.mapped:
+        server = AutocompleteServer.from_mapped_file(
+            args.vocabulary, args.shards, args.cache)
+    else:
+        if args.synthetic is not None:
+            vocabulary = generate_vocabulary(args.synthetic, seed=args.seed)
+        else:
+            vocabulary = iter_lines(args.vocabulary)
+        server = AutocompleteServer(vocabulary, args.algorithm, args.shards,
+                                    args.cache)
+    async with server:
+        address = await server.start(args.unix, args.host, args.port)
+        print('Serving {} words in {} shards on {}'
+              .format(server.size, server.num_shards, address), flush=True)
+        await server.serve_forever()
+
+
+async def load(args):
+    """Send the prefixes to a running server and print the results."""
+    if args.synthetic is not None:
+        vocabulary = generate_vocabulary(args.synthetic, seed=args.seed)
+        prefixes = generate_zipf_prefixes(vocabulary, args.queries,
+                                          args.zipf_exponent, seed=args.seed)
+    else:
+        prefixes = get_lines(args.prefixes)
+    result = await load_test(prefixes, args.unix, args.host, args.port,
+                             args.connections, args.pipeline, args.limit)
+    print_load_test(result, args.json)
+
+
+def main():
+    """Read command-line arguments and run the server or load generator."""
+    parser = argparse.ArgumentParser(
+        description='Serve autocomplete over a socket, or measure the '
+                    'throughput and latency of a running server')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser(
+        'serve', help='answer completion requests until interrupted')
+    serve_parser.add_argument('vocabulary', nargs='?',
+                              default='/usr/share/dict/words',
+                              help='vocabulary file, may be gzipped, or '
+                                   'prefix tree file with --mapped')
+    serve_parser.add_argument('-a', '--algorithm', choices=sorted(BACKENDS),
+                              default='prefix_tree',
+                              help='autocomplete backend of each shard')
+    serve_parser.add_argument('--shards', type=int,
+                              help='shard worker processes (default: CPUs)')
+    serve_parser.add_argument('-c', '--cache', type=int, metavar='ENTRIES',
+                              help='cache this many recent completions in '
+                                   'each shard')
+    serve_parser.add_argument('-m', '--mapped', action='store_true',
+                              help='map the vocabulary file as a prefix tree '
+                                   'file written by mappedprefixtree.py in '
+                                   'every shard instead of building shards')
+    load_parser = commands.add_parser(
+        'load', help='send prefixes to a server and report latency')
+    load_parser.add_argument('prefixes', nargs='?', help='prefixes file')
+    load_parser.add_argument('--connections', type=int, default=4,
+                             help='concurrent connections to open')
+    load_parser.add_argument('--pipeline', type=int, default=16,
+                             help='requests in flight on each connection')
+    load_parser.add_argument('--limit', type=int,
+                             help='maximum completions of each prefix')
+    load_parser.add_argument('--queries', type=int, default=10000,
+                             help='number of synthetic prefixes to send')
+    load_parser.add_argument('--zipf-exponent', type=float, default=1.0,
+                             help='skew of synthetic prefix popularity')
+    load_parser.add_argument('--json', action='store_true',
+                             help='print results as JSON')
+    for subparser in [serve_parser, load_parser]:
+        subparser.add_argument('--unix', metavar='PATH',
+                               help='Unix socket path instead of TCP')
+        subparser.add_argument('--host', default='127.0.0.1',
+                               help='TCP host (default: 127.0.0.1)')
+        subparser.add_argument('--port', type=int, default=8765,
+                               help='TCP port (default: 8765)')
+        subparser.add_argument('-s', '--synthetic', type=int, metavar='SIZE',
+                               help='use a generated vocabulary of this many '
+                                    'random words instead of files')
+        subparser.add_argument('--seed', type=int, default=0,
+                               help='random seed for the synthetic workload')
+    args = parser.parse_args()
+
+    if args.command == 'load' and args.prefixes is None and \
+            args.synthetic is None:
+        parser.error('load needs a prefixes file or --synthetic size')
+    if args.command == 'serve' and args.mapped and \
+            args.synthetic is not None:
+        parser.error('--mapped serves a prefix tree file, not --synthetic')
+    try:
+        asyncio.run(serve(args) if args.command == 'serve' else load(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
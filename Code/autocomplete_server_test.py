@@ -0,0 +1,208 @@
+#!python
+
+from autocomplete_server import (AutocompleteServer, load_test,
+                                 open_connection, partition, shard_index,
+                                 _complete_in_shard, _setup_shard)
+from mappedprefixtree import save
+from prefixtree import PrefixTree
+import autocomplete_server
+import json
+import os
+import tempfile
+import unittest
+
+
+class ShardTest(unittest.TestCase):
+
+    def test_shard_index(self):
+        assert shard_index('', 3) == 0
+        assert shard_index('axle', 1) == 0
+        # Words with the same first character are always in the same shard
+        assert shard_index('axle', 3) == shard_index('apple', 3)
+        assert 0 <= shard_index('matrix', 3) < 3
+
+    def test_shard_index_with_key(self):
+        for num_shards in range(1, 6):
+            assert shard_index('Apple', num_shards, str.lower) == \
+                shard_index('apricot', num_shards, str.lower)
+
+    def test_partition(self):
+        vocabulary = ['axle', 'apple', 'math', 'banana', '']
+        shards = partition(vocabulary, 2)
+        assert len(shards) == 2
+        assert sorted(word for shard in shards for word in shard) == \
+            sorted(vocabulary)
+        for index, shard in enumerate(shards):
+            for word in shard:
+                assert shard_index(word, 2) == index
+
+
+class CompleteInShardTest(unittest.TestCase):
+
+    def setUp(self):
+        # Shard state is global to a worker process, so restore it after
+        self.addCleanup(_setup_shard, [], 'prefix_tree', None)
+
+    def test_returns_list(self):
+        _setup_shard(['b', 'ba', 'c'], 'sorted_array', None)
+        # A list is sent back instead of a view of the whole shard's list
+        assert type(_complete_in_shard('b', None)) is list
+        assert type(_complete_in_shard('b', 1)) is list
+        _setup_shard(['b', 'ba', 'c'], 'sorted_array', 10)
+        assert type(_complete_in_shard('b', None)) is list
+
+    def test_limit_is_sorted_with_or_without_cache(self):
+        for cache_entries in [None, 10]:
+            _setup_shard(['b', 'a', 'c'], 'prefix_tree', cache_entries)
+            assert _complete_in_shard('', 2) == ['a', 'b']
+            assert _complete_in_shard('', 2) == ['a', 'b']
+            assert autocomplete_server._shard_cache is None or \
+                autocomplete_server._shard_cache.hits == 1
+
+
+class AutocompleteServerTest(unittest.IsolatedAsyncioTestCase):
+
+    vocabulary = ['axle', 'axled', 'axlesmith', 'axletree', 'apple', 'math',
+                  'matrix', 'matrices', 'banana']
+
+    async def asyncSetUp(self):
+        self.server = AutocompleteServer(self.vocabulary, 'prefix_tree', 2)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'autocomplete.sock')
+        await self.server.start(self.path)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def request_lines(self, lines) -> [dict]:
+        """Send the given request lines pipelined on one connection and
+        return the responses."""
+        reader, writer = await open_connection(self.path)
+        writer.write(b''.join(line + b'\n' for line in lines))
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in lines]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    async def test_complete(self):
+        assert self.server.size == len(self.vocabulary)
+        for prefix in ['axl', 'mat', 'b', 'c', '']:
+            expected = sorted(word for word in self.vocabulary
+                              if word.startswith(prefix))
+            assert sorted(await self.server.complete(prefix)) == expected
+        assert len(await self.server.complete('axl', 2)) == 2
+        # The empty prefix is answered by every shard, merged in order
+        assert await self.server.complete('', 3) == \
+            sorted(self.vocabulary)[:3]
+
+    async def test_pipelined_requests_in_order(self):
+        prefixes = ['axle', 'b', 'mat', 'x', 'apple'] * 20
+        lines = [json.dumps({'id': index, 'prefix': prefix}).encode()
+                 for index, prefix in enumerate(prefixes)]
+        responses = await self.request_lines(lines)
+        for index, response in enumerate(responses):
+            assert response['id'] == index
+            expected = sorted(word for word in self.vocabulary
+                              if word.startswith(prefixes[index]))
+            assert sorted(response['completions']) == expected
+
+    async def test_invalid_requests(self):
+        responses = await self.request_lines([
+            b'not json', b'[1, 2]', b'{"id": 1}',
+            b'{"id": 2, "prefix": "a", "limit": -1}',
+            b'{"id": 3, "prefix": "axle", "limit": 1}'])
+        for response in responses[:4]:
+            assert 'error' in response
+        assert responses[2]['id'] == 1
+        assert responses[3]['id'] == 2
+        assert responses[4] == {'id': 3, 'completions': ['axle']}
+
+    async def test_failed_requests_keep_connection(self):
+        # Nesting too deep to decode, then valid requests on one connection
+        responses = await self.request_lines([
+            b'[' * 60000, b'{"id": 1, "prefix": "axle", "limit": 1}',
+            b'{"id": 2, "prefix": "a", "limit": true}'])
+        assert 'error' in responses[0]
+        assert responses[1] == {'id': 1, 'completions': ['axle']}
+        assert responses[2]['id'] == 2
+        assert 'error' in responses[2]
+        # A shard that can no longer run tasks fails only its requests
+        for shard in self.server.shards:
+            shard.shutdown()
+        responses = await self.request_lines([b'{"id": 3, "prefix": "a"}'])
+        assert responses[0]['id'] == 3
+        assert 'error' in responses[0]
+
+    async def test_load_test(self):
+        prefixes = ['axl', 'mat', 'b', 'c'] * 10
+        result = await load_test(prefixes, self.path, connections=3,
+                                 pipeline=4)
+        assert result['num_requests'] == 40
+        assert result['num_errors'] == 0
+        assert result['num_completions'] == 10 * (4 + 3 + 1 + 0)
+        latency = result['latency_ns']
+        assert latency['min'] <= latency['p50'] <= latency['p99'] <= \
+            latency['max']
+        with self.assertRaises(ValueError):
+            await load_test(prefixes, self.path, pipeline=0)
+
+
+class AutocompleteServerTCPTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_tcp(self):
+        async with AutocompleteServer(['axle', 'math'],
+                                      num_shards=1) as server:
+            host, port = await server.start(host='127.0.0.1', port=0)
+            result = await load_test(['a', 'm', 'z'], host=host, port=port,
+                                     connections=1)
+            assert result['num_requests'] == 3
+            assert result['num_completions'] == 2
+
+    async def test_normalized_backend(self):
+        vocabulary = ['Apple', 'apricot', 'Éclair', 'banana']
+        async with AutocompleteServer(vocabulary, 'normalized_prefix_tree',
+                                      3) as server:
+            await server.start(host='127.0.0.1', port=0)
+            # Case variants of a prefix are answered by the same shard
+            for prefix in ['ap', 'Ap', 'AP']:
+                assert await server.complete(prefix) == ['Apple', 'apricot']
+            assert await server.complete('éc') == ['Éclair']
+            assert await server.complete('', 3) == \
+                ['Apple', 'apricot', 'banana']
+
+    async def test_mapped_file(self):
+        vocabulary = ['axle', 'axled', 'apple', 'math', 'banana']
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        filename = os.path.join(directory.name, 'vocabulary.ptre')
+        save(PrefixTree(vocabulary), filename)
+        async with AutocompleteServer.from_mapped_file(filename,
+                                                       3) as server:
+            host, port = await server.start(host='127.0.0.1', port=0)
+            # Every shard maps the whole file, so words are counted once
+            assert server.size == len(vocabulary)
+            assert await server.complete('axl') == ['axle', 'axled']
+            assert await server.complete('') == sorted(vocabulary)
+            assert await server.complete('', 2) == ['apple', 'axle']
+            result = await load_test(['a', 'm', 'z'], host=host, port=port,
+                                     connections=1)
+            assert result['num_completions'] == 4
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AutocompleteServer([], 'not_an_algorithm')
+        with self.assertRaises(ValueError):
+            AutocompleteServer([], num_shards=0)
+        with self.assertRaises(ValueError):
+            AutocompleteServer(None)
+        with self.assertRaises(ValueError):
+            AutocompleteServer([], 'mapped_prefix_tree',
+                               mapped_file='vocabulary.ptre')
+        with self.assertRaises(ValueError):
+            AutocompleteServer(None, mapped_file='vocabulary.ptre')
+
+
+if __name__ == '__main__':
+    unittest.main()
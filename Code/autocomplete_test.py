@@ -0,0 +1,252 @@
+#!python
+
+from autocomplete import (BACKENDS, CompletionCache, autocomplete,
+                          autocomplete_setup,
+                          register_backend, generate_vocabulary,
+                          generate_zipf_prefixes, get_lines, iter_lines,
+                          open_mapped_prefix_tree, vocabulary_size)
+from mappedprefixtree import save
+from prefixtree import PrefixTree
+import gzip
+import os
+import tempfile
+import unittest
+
+
+class AutocompleteTest(unittest.TestCase):
+
+    vocabulary = ['axle', 'axled', 'axlesmith', 'axletree', 'apple', 'math',
+                  'matrix', 'matrices']
+
+    def test_all_backends_agree(self):
+        for algorithm in BACKENDS:
+            structure = autocomplete_setup(self.vocabulary, algorithm)
+            for prefix in ['axl', 'axle', 'mat', 'matri', 'a', 'b', 'apples']:
+                expected = sorted(word for word in self.vocabulary
+                                  if word.startswith(prefix))
+                completions = autocomplete(prefix, structure, algorithm)
+                assert sorted(completions) == expected, algorithm
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            autocomplete_setup(self.vocabulary, 'unknown')
+        with self.assertRaises(ValueError):
+            autocomplete('axl', self.vocabulary, 'unknown')
+
+    def test_register_backend(self):
+        register_backend('reversed', lambda words: words[::-1],
+                         lambda prefix, words: [word for word in words
+                                                if word.startswith(prefix)])
+        self.addCleanup(BACKENDS.pop, 'reversed')
+        structure = autocomplete_setup(self.vocabulary, 'reversed')
+        assert autocomplete('axle', structure, 'reversed') == \
+            ['axletree', 'axlesmith', 'axled', 'axle']
+
+    def test_autocomplete_limit(self):
+        for algorithm in BACKENDS:
+            structure = autocomplete_setup(self.vocabulary, algorithm)
+            # Limited completions are the first ones in sorted order
+            assert autocomplete('', structure, algorithm, 3) == \
+                ['apple', 'axle', 'axled']
+            assert autocomplete('mat', structure, algorithm, 1) == ['math']
+            assert autocomplete('b', structure, algorithm, 5) == []
+
+    def test_setup_from_stream(self):
+        for algorithm in BACKENDS:
+            structure = autocomplete_setup(iter(self.vocabulary), algorithm)
+            assert vocabulary_size(structure) == len(self.vocabulary)
+            assert sorted(autocomplete('axle', structure, algorithm)) == \
+                ['axle', 'axled', 'axlesmith', 'axletree']
+
+    def test_open_mapped_prefix_tree(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        filename = os.path.join(directory.name, 'vocabulary.ptre')
+        save(PrefixTree(self.vocabulary), filename)
+        with open_mapped_prefix_tree(filename) as structure:
+            assert vocabulary_size(structure) == len(self.vocabulary)
+            assert autocomplete('axle', structure, 'mapped_prefix_tree') == \
+                ['axle', 'axled', 'axlesmith', 'axletree']
+            assert autocomplete('mat', structure, 'mapped_prefix_tree',
+                                2) == ['math', 'matrices']
+
+
+class IterLinesTest(unittest.TestCase):
+
+    text = '  apple\nbanana \n\ncherry\r\ndate'
+    lines = ['apple', 'banana', '', 'cherry', 'date']
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'words.txt')
+        with open(self.filename, 'w', newline='') as file:
+            file.write(self.text)
+        self.gzip_filename = os.path.join(directory.name, 'words.txt.gz')
+        with gzip.open(self.gzip_filename, 'wt', newline='') as file:
+            file.write(self.text)
+
+    def test_iter_lines(self):
+        assert list(iter_lines(self.filename)) == self.lines
+        assert get_lines(self.filename) == self.lines
+
+    def test_iter_lines_small_chunks(self):
+        # Lines split across chunk boundaries are joined back together
+        for chunk_size in range(1, 8):
+            assert list(iter_lines(self.filename, chunk_size)) == self.lines
+
+    def test_iter_lines_trailing_newline(self):
+        with open(self.filename, 'a') as file:
+            file.write('\n')
+        assert list(iter_lines(self.filename)) == self.lines
+
+    def test_iter_lines_gzip(self):
+        assert list(iter_lines(self.gzip_filename)) == self.lines
+        assert list(iter_lines(self.gzip_filename, 3)) == self.lines
+        assert get_lines(self.gzip_filename) == self.lines
+
+    def test_iter_lines_is_lazy(self):
+        lines = iter_lines(self.filename, 4)
+        assert next(lines) == 'apple'
+
+
+class CompletionCacheTest(unittest.TestCase):
+
+    vocabulary = ['axle', 'axled', 'axlesmith', 'axletree', 'apple', 'math']
+
+    def test_hits_and_misses(self):
+        structure = autocomplete_setup(self.vocabulary, 'prefix_tree')
+        cache = CompletionCache(structure, 'prefix_tree')
+        expected = autocomplete('axl', structure, 'prefix_tree')
+        assert cache.complete('axl') == expected
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert cache.complete('axl') == expected
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate() == 0.5
+        # Verify the limit is part of the key
+        assert cache.complete('axl', 2) == expected[:2]
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert len(cache) == 2
+
+    def test_returns_lists(self):
+        structure = autocomplete_setup(self.vocabulary, 'sorted_array')
+        cache = CompletionCache(structure, 'sorted_array')
+        # Both a miss and a hit return a list, not the backend's view
+        assert type(cache.complete('axl')) is list
+        assert type(cache.complete('axl')) is list
+        assert type(cache.complete('axl', 2)) is list
+
+    def test_limit_is_sorted(self):
+        vocabulary = ['b', 'a', 'c', 'ab']
+        for algorithm in ['prefix_tree', 'linear_search', 'sorted_array']:
+            structure = autocomplete_setup(vocabulary, algorithm)
+            cache = CompletionCache(structure, algorithm)
+            assert cache.complete('', 2) == ['a', 'ab']
+            assert cache.complete('', 2) == ['a', 'ab']
+
+    def test_returned_completions_are_copies(self):
+        structure = autocomplete_setup(self.vocabulary, 'prefix_tree')
+        cache = CompletionCache(structure, 'prefix_tree')
+        cache.complete('m').append('junk')
+        cache.complete('m').append('junk')
+        assert cache.complete('m') == ['math']
+
+    def test_evicts_least_recently_used(self):
+        structure = autocomplete_setup(self.vocabulary, 'linear_search')
+        cache = CompletionCache(structure, 'linear_search', max_entries=2)
+        cache.complete('a')
+        cache.complete('m')
+        # Use prefix a again so that prefix m is least recently used
+        cache.complete('a')
+        cache.complete('ax')
+        assert len(cache) == 2
+        assert cache.evictions == 1
+        assert ('m', None) not in cache.entries
+        assert ('a', None) in cache.entries
+
+    def test_evicts_by_memory(self):
+        structure = autocomplete_setup(self.vocabulary, 'sorted_array')
+        unbounded = CompletionCache(structure, 'sorted_array')
+        unbounded.complete('a')
+        size = unbounded.num_bytes
+        cache = CompletionCache(structure, 'sorted_array', max_bytes=size)
+        cache.complete('a')
+        assert len(cache) == 1
+        cache.complete('m')
+        assert len(cache) == 1
+        assert cache.num_bytes <= size
+        # Verify an entry too large to ever fit is not cached
+        cache = CompletionCache(structure, 'sorted_array', max_bytes=size - 1)
+        assert cache.complete('a') == unbounded.complete('a')
+        assert len(cache) == 0
+
+    def test_invalidated_by_insert(self):
+        structure = autocomplete_setup(self.vocabulary, 'prefix_tree')
+        cache = CompletionCache(structure, 'prefix_tree')
+        assert cache.complete('mat') == ['math']
+        structure.insert('matrix')
+        assert sorted(cache.complete('mat')) == ['math', 'matrix']
+        structure.delete('math')
+        assert cache.complete('mat') == ['matrix']
+        assert cache.hits == 0
+
+    def test_invalidated_by_new_surface_form(self):
+        structure = autocomplete_setup(['cafe'], 'normalized_prefix_tree')
+        cache = CompletionCache(structure, 'normalized_prefix_tree')
+        assert cache.complete('caf') == ['cafe']
+        # A new form of a stored key changes completions
+        structure.insert('CAFE')
+        assert cache.complete('caf') == ['cafe', 'CAFE']
+        # Removing a form that is not the key's last changes them too
+        structure.delete('cafe')
+        assert cache.complete('caf') == ['CAFE']
+        assert cache.hits == 0
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            CompletionCache([], 'linear_search', max_entries=-1)
+        with self.assertRaises(ValueError):
+            CompletionCache([], 'linear_search', max_bytes=-1)
+
+
+class WorkloadTest(unittest.TestCase):
+
+    def test_generate_vocabulary(self):
+        vocabulary = generate_vocabulary(1000, alphabet='abc', min_length=2,
+                                         max_length=8, seed=1)
+        assert len(vocabulary) == 1000
+        assert len(set(vocabulary)) == 1000
+        assert all(2 <= len(word) <= 8 for word in vocabulary)
+        assert all(set(word) <= set('abc') for word in vocabulary)
+        # Verify the same seed generates the same words in the same order
+        assert vocabulary == generate_vocabulary(1000, alphabet='abc',
+                                                 min_length=2, max_length=8,
+                                                 seed=1)
+        assert vocabulary != generate_vocabulary(1000, alphabet='abc',
+                                                 min_length=2, max_length=8,
+                                                 seed=2)
+
+    def test_generate_vocabulary_too_large(self):
+        with self.assertRaises(ValueError):
+            generate_vocabulary(10, alphabet='ab', min_length=1, max_length=2)
+
+    def test_generate_zipf_prefixes(self):
+        vocabulary = generate_vocabulary(100, seed=1)
+        prefixes = generate_zipf_prefixes(vocabulary, 5000, exponent=1.2,
+                                          seed=1)
+        assert len(prefixes) == 5000
+        assert prefixes == generate_zipf_prefixes(vocabulary, 5000,
+                                                  exponent=1.2, seed=1)
+        # Verify every query is a non-empty prefix of a vocabulary word
+        assert all(len(prefix) >= 1 and
+                   any(word.startswith(prefix) for word in vocabulary)
+                   for prefix in prefixes)
+        # Verify the most popular word is queried far more than the least
+        first = sum(vocabulary[0].startswith(prefix) for prefix in prefixes)
+        last = sum(vocabulary[-1].startswith(prefix) and
+                   not vocabulary[0].startswith(prefix) for prefix in prefixes)
+        assert first > 10 * max(last, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
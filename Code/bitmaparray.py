@@ -0,0 +1,72 @@
+#!python3
+
+# Bit of each index in a bitmap and mask of the bits below it, precomputed
+# since shifting big integers at every lookup is slower
+BITS = [1 << index for index in range(256)]
+MASKS = [(1 << index) - 1 for index in range(256)]
+
+
+class BitmapArray:
+    """BitmapArray: A sparse array with room for an entry at each index from 0
+    to 255, used as the table of children of a prefix tree node (see
+    BytesPrefixTreeNode and BitmapChildren). Entries that exist are stored in
+    a dense list in order of index, with a bitmap that has one bit set for
+    each index that has an entry. An index's entry is at the position given by
+    the number of bits set below its bit, as in a hash array mapped trie, so
+    lookup is a bit test, a population count and a list index, without
+    hashing, and only existing entries take space."""
+
+    __slots__ = ('bitmap', 'entries')
+
+    def __init__(self):
+        """Initialize this array with no entries."""
+        # Bit i is set if this array has an entry at index i
+        self.bitmap = 0
+        # Shared empty tuple until the first entry is added, since most nodes
+        # in a prefix tree are leaves with no children
+        self.entries = ()
+
+    def has_entry(self, index: int) -> bool:
+        """Return True if this array has an entry at the given index."""
+        return self.bitmap & BITS[index] != 0
+
+    def get_entry(self, index: int, default=None) -> object:
+        """Return this array's entry at the given index, or the given default
+        if it has no entry at that index."""
+        bitmap = self.bitmap
+        if not bitmap & BITS[index]:
+            return default
+        return self.entries[(bitmap & MASKS[index]).bit_count()]
+
+    def set_entry(self, index: int, entry: object):
+        """Set this array's entry at the given index to the given entry,
+        replacing any entry there, or raise ValueError if the index is not
+        between 0 and 255."""
+        if not 0 <= index < 256:
+            raise ValueError(f'Index out of range: {index!r}')
+        position = (self.bitmap & MASKS[index]).bit_count()
+        # case: replace the existing entry in place
+        if self.bitmap & BITS[index]:
+            self.entries[position] = entry
+            return
+        if not self.entries:
+            self.entries = []
+        self.entries.insert(position, entry)
+        self.bitmap |= BITS[index]
+
+    def delete_entry(self, index: int):
+        """Remove this array's entry at the given index, or raise ValueError
+        if it has no entry at that index."""
+        if not 0 <= index < 256 or not self.bitmap & BITS[index]:
+            raise ValueError(f'No entry exists at index: {index!r}')
+        del self.entries[(self.bitmap & MASKS[index]).bit_count()]
+        self.bitmap ^= BITS[index]
+
+    def indexes(self):
+        """Return a generator of the indexes of this array's entries in
+        increasing order, in the same order as its entries."""
+        bitmap = self.bitmap
+        while bitmap:
+            lowest = bitmap & -bitmap
+            yield lowest.bit_length() - 1
+            bitmap ^= lowest
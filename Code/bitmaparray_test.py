@@ -0,0 +1,54 @@
+#!python
+
+from bitmaparray import BitmapArray
+import unittest
+
+
+class BitmapArrayTest(unittest.TestCase):
+
+    def test_init(self):
+        array = BitmapArray()
+        assert array.bitmap == 0
+        assert len(array.entries) == 0
+        assert list(array.indexes()) == []
+        assert array.get_entry(0) is None
+        assert array.get_entry(255, 'default') == 'default'
+
+    def test_set_and_get_entries(self):
+        array = BitmapArray()
+        for index in [200, 0, 97, 255]:
+            array.set_entry(index, str(index))
+        # Entries are stored densely in order of index
+        assert array.entries == ['0', '97', '200', '255']
+        assert list(array.indexes()) == [0, 97, 200, 255]
+        for index in [0, 97, 200, 255]:
+            assert array.has_entry(index)
+            assert array.get_entry(index) == str(index)
+        assert not array.has_entry(98)
+        assert array.get_entry(98) is None
+        # Replacing an entry keeps the bitmap and number of entries
+        array.set_entry(97, 'a')
+        assert array.get_entry(97) == 'a'
+        assert len(array.entries) == 4
+        with self.assertRaises(ValueError):
+            array.set_entry(256, 'x')
+        with self.assertRaises(ValueError):
+            array.set_entry(-1, 'x')
+
+    def test_delete_entry(self):
+        array = BitmapArray()
+        array.set_entry(10, 'first')
+        array.set_entry(20, 'second')
+        array.delete_entry(10)
+        assert not array.has_entry(10)
+        assert array.get_entry(20) == 'second'
+        assert array.bitmap == 1 << 20
+        with self.assertRaises(ValueError):
+            array.delete_entry(10)
+        array.delete_entry(20)
+        assert array.bitmap == 0
+        assert list(array.indexes()) == []
+
+
+if __name__ == '__main__':
+    unittest.main()
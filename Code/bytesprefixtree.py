@@ -0,0 +1,214 @@
+#!python3
+
+from bitmaparray import BITS, MASKS, BitmapArray
+
+
+class BytesPrefixTreeNode(BitmapArray):
+    """BytesPrefixTreeNode: A node for use in a byte-level prefix tree that
+    stores its children for up to 256 byte values in a BitmapArray indexed by
+    byte value, so a child is found with a bit test, a population count and a
+    list index, without hashing, and only existing children take space."""
+
+    __slots__ = ('terminal',)
+
+    def __init__(self):
+        """Initialize this node with no children nodes and a boolean terminal
+        property."""
+        super().__init__()
+        # Marks if this node terminates a string in the prefix tree
+        self.terminal = False
+
+    def is_terminal(self) -> bool:
+        """Return True if this node terminates a string."""
+        return self.terminal
+
+    def num_children(self) -> int:
+        """Return the number of children nodes this node has."""
+        return len(self.entries)
+
+    def get_child(self, byte: int) -> object:
+        """Return this node's child node for the given byte value, or None if
+        it has no child for that byte."""
+        return self.get_entry(byte)
+
+    def add_child(self, byte: int, child_node: object):
+        """Add the given child node for the given byte value, or raise
+        ValueError if this node already has a child for that byte."""
+        if 0 <= byte < 256 and self.has_entry(byte):
+            raise ValueError(f'Child exists for byte: {byte!r}')
+        self.set_entry(byte, child_node)
+
+    def remove_child(self, byte: int):
+        """Remove this node's child node for the given byte value, or raise
+        ValueError if it has no child for that byte."""
+        self.delete_entry(byte)
+
+    def items(self):
+        """Return an iterator of (byte value, child node) pairs of this node's
+        children in order of byte value."""
+        return zip(self.indexes(), self.entries)
+
+    def __repr__(self):
+        """Return a code representation of this node."""
+        return f'BytesPrefixTreeNode({bytes(self.indexes())!r})'
+
+
+def to_bytes(key) -> object:
+    """Return the given key as a bytes-like object of UTF-8 encoded bytes if
+    it is a string, or else as a view of its bytes without copying them."""
+    if isinstance(key, str):
+        return key.encode('utf-8')
+    if isinstance(key, (bytes, bytearray)):
+        return key
+    return memoryview(key).cast('B')
+
+
+class BytesPrefixTree:
+    """BytesPrefixTree: A prefix tree with the same methods as PrefixTree that
+    stores strings as their UTF-8 encoded bytes, with one node per byte
+    instead of one per character. Each node finds a child by indexing its
+    bitmap of byte values instead of hashing a character (see
+    BytesPrefixTreeNode). Methods accept keys as strings or as bytes,
+    bytearray or memoryview objects, which are searched without being copied
+    or decoded. Completions are strings for a string prefix and bytes for a
+    bytes-like prefix. UTF-8 preserves code point order, so strings are
+    retrieved in lexicographic order. Trees can be saved in the format that
+    MappedPrefixTree reads from disk, with the same one-byte edges."""
+
+    def __init__(self, strings=None):
+        """Initialize this prefix tree and insert the given strings, if any."""
+        self.root = BytesPrefixTreeNode()
+        # Count the number of complete words inserted into the tree
+        self.size = 0
+        # Insert each string, if any were given
+        if strings is not None:
+            for string in strings:
+                self.insert(string)
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'BytesPrefixTree({self.strings()!r})'
+
+    def is_empty(self) -> bool:
+        """Return True if this prefix tree is empty (contains no strings)."""
+        return self.size == 0
+
+    def contains(self, word) -> bool:
+        """Return True if this prefix tree contains the given string."""
+        node = self._find_node(to_bytes(word))
+        return node is not None and node.terminal
+
+    def insert(self, word):
+        """Insert the given string into this prefix tree."""
+        node = self.root
+        for byte in to_bytes(word):
+            child = node.get_child(byte)
+            # case: the byte does not exist as a child from current node
+            if child is None:
+                child = BytesPrefixTreeNode()
+                node.add_child(byte, child)
+            # traverse down
+            node = child
+        # case: node already exists & is a terminal
+        if node.terminal:
+            return
+        node.terminal = True
+        self.size += 1
+
+    def delete(self, word):
+        """Remove the given string from this prefix tree, or raise ValueError
+        if it is not stored in it. Nodes left with no children that do not
+        terminate another string are pruned from the bottom of the path up."""
+        key = to_bytes(word)
+        node = self.root
+        # Nodes along the path from the root to the end of the word
+        path = [node]
+        for byte in key:
+            node = node.get_child(byte)
+            if node is None:
+                break
+            path.append(node)
+        if node is None or not node.terminal:
+            raise ValueError(f'String not found: {word!r}')
+        node.terminal = False
+        self.size -= 1
+        # Prune the chain of nodes that no longer lead to any string
+        while len(path) > 1 and not path[-1].terminal and not path[-1].entries:
+            path.pop()
+            path[-1].remove_child(key[len(path) - 1])
+
+    def _find_node(self, key) -> BytesPrefixTreeNode:
+        """Return the node that terminates the given bytes-like key in this
+        prefix tree, or None if the key is not completely found."""
+        node = self.root
+        for byte in key:
+            # Inlined child lookup since this runs once per byte searched
+            bitmap = node.bitmap
+            if not bitmap & BITS[byte]:
+                return None
+            node = node.entries[(bitmap & MASKS[byte]).bit_count()]
+        return node
+
+    def num_nodes(self) -> int:
+        """Return the number of nodes stored in this prefix tree."""
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.entries)
+        return count
+
+    def complete(self, word_or_prefix) -> list:
+        """Return a list of all strings stored in this prefix tree that start
+        with the given prefix, as strings if the prefix is a string or else as
+        bytes."""
+        completions = []
+        key = to_bytes(word_or_prefix)
+        node = self._find_node(key)
+        # case: prefix does not exist
+        if node is None:
+            return completions
+        if isinstance(word_or_prefix, str):
+            self._traverse(node, key, lambda path: completions.append(
+                path.decode('utf-8', 'surrogateescape')))
+        else:
+            self._traverse(node, key, lambda path: completions.append(
+                bytes(path)))
+        return completions
+
+    def strings(self) -> [str]:
+        """Return a list of all strings stored in this prefix tree."""
+        return self.complete('')
+
+    def keys(self) -> [bytes]:
+        """Return a list of the encoded bytes of all strings stored in this
+        prefix tree."""
+        return self.complete(b'')
+
+    def _traverse(self, node: BytesPrefixTreeNode, prefix, visit):
+        """Traverse the subtree below the given node in order of byte value
+        with an iterative depth-first traversal and visit each path of bytes
+        that terminates in it, as a bytearray, with the given function. The
+        given prefix is the key of the path from the root to the given node."""
+        # Shared buffer of the bytes on the path to the current node
+        path = bytearray(prefix)
+        if node.terminal:
+            visit(path)
+        # Stack of iterators over the children of each node on the path
+        stack = [node.items()]
+        while stack:
+            for byte, child in stack[-1]:
+                path.append(byte)
+                if child.terminal:
+                    visit(path)
+                # case: descend into this child before its next sibling
+                if child.entries:
+                    stack.append(child.items())
+                    break
+                path.pop()
+            else:
+                # case: all children at this depth are done so go back up
+                stack.pop()
+                if stack:
+                    path.pop()
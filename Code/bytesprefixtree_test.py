@@ -0,0 +1,109 @@
+#!python
+
+from bytesprefixtree import BytesPrefixTree, BytesPrefixTreeNode, to_bytes
+import unittest
+
+
+class BytesPrefixTreeNodeTest(unittest.TestCase):
+
+    def test_add_and_get_children(self):
+        node = BytesPrefixTreeNode()
+        children = {byte: BytesPrefixTreeNode() for byte in [200, 0, 97, 255]}
+        for byte, child in children.items():
+            node.add_child(byte, child)
+        assert node.num_children() == 4
+        for byte, child in children.items():
+            assert node.get_child(byte) is child
+        assert node.get_child(98) is None
+        # Children are stored in order of byte value
+        assert [byte for byte, _ in node.items()] == [0, 97, 200, 255]
+        assert [child for _, child in node.items()] == node.entries
+
+    def test_add_child_errors(self):
+        node = BytesPrefixTreeNode()
+        node.add_child(1, BytesPrefixTreeNode())
+        with self.assertRaises(ValueError):
+            node.add_child(1, BytesPrefixTreeNode())
+        with self.assertRaises(ValueError):
+            node.add_child(256, BytesPrefixTreeNode())
+
+    def test_remove_child(self):
+        node = BytesPrefixTreeNode()
+        first, second = BytesPrefixTreeNode(), BytesPrefixTreeNode()
+        node.add_child(10, first)
+        node.add_child(20, second)
+        node.remove_child(10)
+        assert node.get_child(10) is None
+        assert node.get_child(20) is second
+        assert node.bitmap == 1 << 20
+        with self.assertRaises(ValueError):
+            node.remove_child(10)
+
+
+class BytesPrefixTreeTest(unittest.TestCase):
+
+    def test_to_bytes(self):
+        assert to_bytes('é') == b'\xc3\xa9'
+        assert to_bytes(b'ab') == b'ab'
+        data = bytearray(b'ab')
+        assert to_bytes(data) is data
+        view = to_bytes(memoryview(b'abc')[1:])
+        assert isinstance(view, memoryview)
+        assert bytes(view) == b'bc'
+
+    def test_insert_and_contains(self):
+        tree = BytesPrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.size == 4
+        for word in ['ABC', 'ABD', 'A', 'XYZ']:
+            assert tree.contains(word) is True
+        for word in ['', 'AB', 'ABCD', 'B', 'XY']:
+            assert tree.contains(word) is False
+        # Repeated insert does not change the size
+        tree.insert('ABC')
+        assert tree.size == 4
+
+    def test_bytes_like_keys(self):
+        tree = BytesPrefixTree([b'axle', bytearray(b'axled'),
+                                memoryview(b'--math--')[2:-2]])
+        assert tree.contains('axle') is True
+        assert tree.contains(b'math') is True
+        assert tree.contains(memoryview(b'axled')) is True
+        assert tree.complete(b'ax') == [b'axle', b'axled']
+        assert tree.complete(memoryview(b'm')) == [b'math']
+        assert tree.complete('ax') == ['axle', 'axled']
+
+    def test_unicode_strings(self):
+        strings = ['café', 'cafe', 'caffè', 'naïve', '日本', '日本語', '']
+        tree = BytesPrefixTree(strings)
+        assert tree.size == len(strings)
+        # UTF-8 byte order is code point order
+        assert tree.strings() == sorted(strings)
+        assert tree.complete('caf') == ['cafe', 'caffè', 'café']
+        assert tree.complete('日') == ['日本', '日本語']
+        assert tree.keys()[1] == b'cafe'
+        # The first byte of a multibyte character is a node of its own
+        assert tree.root.get_child('日'.encode('utf-8')[0]) is not None
+
+    def test_complete_missing_prefix(self):
+        tree = BytesPrefixTree(['axle'])
+        assert tree.complete('b') == []
+        assert tree.complete(b'axles') == []
+
+    def test_delete(self):
+        tree = BytesPrefixTree(['ABC', 'ABD', 'A', 'naïve'])
+        num_nodes = tree.num_nodes()
+        tree.delete('ABC')
+        assert tree.contains('ABC') is False
+        assert tree.num_nodes() == num_nodes - 1
+        tree.delete(b'na\xc3\xafve')
+        assert tree.strings() == ['A', 'ABD']
+        assert tree.root.get_child(ord('n')) is None
+        with self.assertRaises(ValueError):
+            tree.delete('AB')
+        with self.assertRaises(ValueError):
+            tree.delete('ABC')
+        assert tree.size == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!python3
+
+from array import array
+
+
+class CompactPrefixTree:
+    """CompactPrefixTree: A prefix tree with the same methods as PrefixTree
+    that stores its nodes in parallel arrays instead of one object per node.
+    Each node is an integer index into these arrays, which store the node's
+    character code point, the index of its first child node, the index of its
+    next sibling node, and a bit in a bitmap that marks terminal nodes.
+    Sibling nodes form a linked list kept in sorted order by character, so
+    strings are always retrieved in lexicographic order. Storing only a few
+    machine integers per node uses far less memory than a node object with its
+    own dictionary of children, at the cost of scanning siblings on lookup."""
+
+    # Constant for the start character stored in the prefix tree's root node
+    START_CHARACTER = ''
+
+    # Index of the root node and sentinel index for a missing node
+    ROOT = 0
+    NO_NODE = -1
+
+    def __init__(self, strings=None):
+        """Initialize this prefix tree and insert the given strings, if any."""
+        # Character code point that each node represents (root has none)
+        self.labels = array('I', [0])
+        # Index of each node's first child node and next sibling node
+        self.first_child = array('i', [CompactPrefixTree.NO_NODE])
+        self.next_sibling = array('i', [CompactPrefixTree.NO_NODE])
+        # Bitmap with one bit per node that marks if it terminates a string
+        self.terminal = bytearray(1)
+        # Count the number of complete words inserted into the tree
+        self.size = 0
+        # Insert each string, if any were given
+        if strings is not None:
+            for string in strings:
+                self.insert(string)
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'CompactPrefixTree({self.strings()!r})'
+
+    def is_empty(self) -> bool:
+        """Return True if this prefix tree is empty (contains no strings)."""
+        return self.size == 0
+
+    def num_nodes(self) -> int:
+        """Return the number of nodes stored in this prefix tree."""
+        return len(self.labels)
+
+    def is_terminal(self, node: int) -> bool:
+        """Return True if the node at the given index terminates a string."""
+        return bool(self.terminal[node >> 3] & (1 << (node & 7)))
+
+    def _set_terminal(self, node: int):
+        """Mark the node at the given index as terminating a string."""
+        self.terminal[node >> 3] |= 1 << (node & 7)
+
+    def contains(self, word: str) -> bool:
+        """Return True if this prefix tree contains the given string."""
+        node, _ = self._find_node(word)
+        return node is not None and self.is_terminal(node)
+
+    def insert(self, word: str):
+        """Insert the given string into this prefix tree."""
+        labels = self.labels
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        node = CompactPrefixTree.ROOT
+        for letter in word:
+            code = ord(letter)
+            # Scan the sorted list of siblings for the matching child node
+            previous = CompactPrefixTree.NO_NODE
+            child = first_child[node]
+            while child != CompactPrefixTree.NO_NODE and labels[child] < code:
+                previous = child
+                child = next_sibling[child]
+            # case: the letter does not exist as a child from current node
+            if child == CompactPrefixTree.NO_NODE or labels[child] != code:
+                child = self._add_node(code, child)
+                # Link the new child node in sorted position among siblings
+                if previous == CompactPrefixTree.NO_NODE:
+                    first_child[node] = child
+                else:
+                    next_sibling[previous] = child
+            # traverse down
+            node = child
+        # case: node already exists & is a terminal
+        if self.is_terminal(node):
+            return
+        self._set_terminal(node)
+        self.size += 1
+
+    def _add_node(self, code: int, sibling: int) -> int:
+        """Append a new node with the given character code point and next
+        sibling node to the parallel arrays and return the new node's index."""
+        node = len(self.labels)
+        self.labels.append(code)
+        self.first_child.append(CompactPrefixTree.NO_NODE)
+        self.next_sibling.append(sibling)
+        # Grow the terminal bitmap by one byte for every eight nodes
+        if node >> 3 >= len(self.terminal):
+            self.terminal.append(0)
+        return node
+
+    def _find_node(self, word: str) -> (int, int):
+        """Return a tuple containing the index of the node that terminates the
+        given string in this prefix tree and the node's depth, or if the given
+        string is not completely found, return None and the depth of the last
+        matching node. Search is done iteratively starting from the root."""
+        labels = self.labels
+        next_sibling = self.next_sibling
+        depth = 0
+        node = CompactPrefixTree.ROOT
+        for letter in word:
+            code = ord(letter)
+            child = self.first_child[node]
+            # Siblings are sorted so stop scanning once past the character
+            while child != CompactPrefixTree.NO_NODE and labels[child] < code:
+                child = next_sibling[child]
+            if child == CompactPrefixTree.NO_NODE or labels[child] != code:
+                return None, depth
+            node = child
+            depth += 1
+        return node, depth
+
+    def complete(self, word_or_prefix: str) -> [str]:
+        """Return a list of all strings stored in this prefix tree that start
+        with the given prefix string."""
+        completions = []
+        node, _ = self._find_node(word_or_prefix)
+        # case: prefix does not exist
+        if node is None:
+            return completions
+        self._traverse(node, word_or_prefix, completions.append)
+        return completions
+
+    def strings(self) -> [str]:
+        """Return a list of all strings stored in this prefix tree."""
+        all_strings = []
+        self._traverse(CompactPrefixTree.ROOT, '', all_strings.append)
+        return all_strings
+
+    def _traverse(self, node: int, prefix: str, visit):
+        """Traverse the subtree below the given node in lexicographic order
+        with an iterative depth-first traversal and visit each string that
+        terminates in it with the given function. The given prefix is the
+        string represented by the path from the root to the given node."""
+        labels = self.labels
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        if self.is_terminal(node):
+            visit(prefix)
+        # Stack of sibling nodes still to visit and the prefix length above them
+        stack = [(first_child[node], len(prefix))]
+        # Shared buffer of characters on the path to the current node
+        path = list(prefix)
+        while stack:
+            child, depth = stack.pop()
+            if child == CompactPrefixTree.NO_NODE:
+                continue
+            # Resume with this node's next sibling after its subtree is done
+            stack.append((next_sibling[child], depth))
+            del path[depth:]
+            path.append(chr(labels[child]))
+            if self.is_terminal(child):
+                visit(''.join(path))
+            stack.append((first_child[child], depth + 1))
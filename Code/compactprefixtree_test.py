@@ -0,0 +1,79 @@
+#!python3
+
+from compactprefixtree import CompactPrefixTree
+from prefixtree import PrefixTree
+import unittest
+
+
+class CompactPrefixTreeTest(unittest.TestCase):
+
+    def test_init_and_properties(self):
+        tree = CompactPrefixTree()
+        # Verify tree size property
+        assert tree.size == 0
+        assert tree.is_empty() is True
+        # Verify tree only has a root node that is not terminal
+        assert tree.num_nodes() == 1
+        assert tree.is_terminal(CompactPrefixTree.ROOT) is False
+
+    def test_insert_shares_prefix_nodes(self):
+        tree = CompactPrefixTree()
+        tree.insert('ABC')
+        assert tree.num_nodes() == 4
+        # Insert string with partial overlap so only one new node is added
+        tree.insert('ABD')
+        assert tree.num_nodes() == 5
+        # Insert substring already in tree so no new nodes are added
+        tree.insert('A')
+        assert tree.num_nodes() == 5
+        assert tree.size == 3
+
+    def test_size_with_repeated_insert(self):
+        tree = CompactPrefixTree()
+        for string in ['A', 'A', 'ABC', 'ABC', 'ABD', 'XYZ', 'XYZ']:
+            tree.insert(string)
+        assert tree.size == 4
+        assert tree.is_empty() is False
+
+    def test_contains(self):
+        tree = CompactPrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.contains('ABC') is True
+        assert tree.contains('ABD') is True
+        assert tree.contains('A') is True
+        assert tree.contains('XYZ') is True
+        assert tree.contains('AB') is False
+        assert tree.contains('BC') is False
+        assert tree.contains('XY') is False
+        assert tree.contains('Z') is False
+
+    def test_complete(self):
+        tree = CompactPrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.complete('ABC') == ['ABC']
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        assert tree.complete('A') == ['A', 'ABC', 'ABD']
+        assert tree.complete('XY') == ['XYZ']
+        assert tree.complete('BC') == []
+        assert tree.complete('Y') == []
+
+    def test_strings_in_lexicographic_order(self):
+        strings = ['XYZ', 'ABD', 'A', 'ABC', 'B', 'AA']
+        tree = CompactPrefixTree(strings)
+        assert tree.strings() == sorted(strings)
+
+    def test_terminal_bitmap_grows_with_nodes(self):
+        strings = [f'word{number}' for number in range(100)]
+        tree = CompactPrefixTree(strings)
+        assert tree.size == 100
+        assert len(tree.terminal) * 8 >= tree.num_nodes()
+        assert tree.strings() == sorted(strings)
+
+    def test_matches_prefix_tree(self):
+        strings = 'Shelly sells seashells by the sea shore'.split()
+        compact_tree = CompactPrefixTree(strings)
+        tree = PrefixTree(strings)
+        for prefix in ['', 'S', 's', 'se', 'sea', 'sh', 'b', 'x']:
+            assert compact_tree.complete(prefix) == sorted(tree.complete(prefix))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+#!python3
+
+from prefixtree import PrefixTree
+
+
+class FrozenPrefixTreeNode:
+    """FrozenPrefixTreeNode: An immutable node in a frozen prefix tree that
+    stores the characters of its outgoing edges as one sorted string, the child
+    nodes those edges lead to in the same order, and a boolean terminal
+    property. Nodes are shared between every path with an identical suffix."""
+
+    __slots__ = ('characters', 'children', 'terminal')
+
+    def __init__(self, characters, children, terminal):
+        """Initialize this node with the given sorted string of characters,
+        tuple of children nodes, and boolean terminal property."""
+        self.characters = characters
+        self.children = children
+        self.terminal = terminal
+
+    def is_terminal(self) -> bool:
+        """Return True if this node terminates a string."""
+        return self.terminal
+
+    def num_children(self) -> int:
+        """Return the number of children nodes this node has."""
+        return len(self.children)
+
+    def get_child(self, character: str) -> object:
+        """Return this node's child node that represents the given character
+        if it is amongst its children, or None if not."""
+        index = self.characters.find(character)
+        if index < 0:
+            return None
+        return self.children[index]
+
+    def __repr__(self):
+        """Return a code representation of this node."""
+        return f'FrozenPrefixTreeNode({self.characters!r})'
+
+
+class FrozenPrefixTree:
+    """FrozenPrefixTree: An immutable prefix tree compiled into a minimal
+    directed acyclic word graph (DAWG). Subtrees that store the same set of
+    suffixes are merged into a single shared node, so common word endings such
+    as 'ing' or 'tion' are stored once instead of once per word. Supports the
+    read-only methods of PrefixTree and retrieves strings in sorted order."""
+
+    def __init__(self, strings=None):
+        """Initialize this frozen prefix tree with the given strings, if any."""
+        tree = PrefixTree(strings)
+        self.root = _minimize(tree.root)
+        # Count the number of complete words stored in the tree
+        self.size = tree.size
+
+    @classmethod
+    def from_tree(cls, tree):
+        """Return a new frozen prefix tree that stores the same strings as the
+        given prefix tree, which is left unchanged."""
+        frozen = cls.__new__(cls)
+        frozen.root = _minimize(tree.root)
+        frozen.size = tree.size
+        return frozen
+
+    def __repr__(self):
+        """Return a string representation of this frozen prefix tree."""
+        return f'FrozenPrefixTree({self.strings()!r})'
+
+    def is_empty(self) -> bool:
+        """Return True if this prefix tree is empty (contains no strings)."""
+        return self.size == 0
+
+    def num_nodes(self) -> int:
+        """Return the number of distinct nodes in this word graph."""
+        seen = {id(self.root)}
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+        return len(seen)
+
+    def contains(self, word: str) -> bool:
+        """Return True if this prefix tree contains the given string."""
+        node = self._find_node(word)
+        return node is not None and node.terminal
+
+    def _find_node(self, word: str) -> FrozenPrefixTreeNode:
+        """Return the node reached by following the given string from the root
+        node, or None if the given string is not completely found."""
+        node = self.root
+        for char in word:
+            node = node.get_child(char)
+            if node is None:
+                return None
+        return node
+
+    def complete(self, word_or_prefix: str) -> [str]:
+        """Return a list of all strings stored in this prefix tree that start
+        with the given prefix string."""
+        completions = []
+        node = self._find_node(word_or_prefix)
+        # case: prefix does not exist
+        if node is None:
+            return completions
+        self._traverse(node, word_or_prefix, completions.append)
+        return completions
+
+    def strings(self) -> [str]:
+        """Return a list of all strings stored in this prefix tree."""
+        all_strings = []
+        self._traverse(self.root, '', all_strings.append)
+        return all_strings
+
+    def _traverse(self, node: FrozenPrefixTreeNode, prefix: str, visit):
+        """Traverse all paths below the given node in lexicographic order with
+        an iterative depth-first traversal and visit each string that
+        terminates along them with the given function."""
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            if node.terminal:
+                visit(prefix)
+            # Push children in reverse so they are popped in sorted order
+            for index in range(len(node.children) - 1, -1, -1):
+                stack.append((node.children[index],
+                              prefix + node.characters[index]))
+
+
+def _minimize(root) -> FrozenPrefixTreeNode:
+    """Return the root of a minimal word graph that stores the same strings as
+    the prefix tree below the given root node. Nodes are frozen in post-order
+    and looked up in a register by their terminal property and outgoing edges,
+    so any subtree identical to one already frozen reuses the same node."""
+    register = {}
+    frozen = {}
+    # Iterative post-order traversal to avoid recursion on very long strings
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children.values())
+            continue
+        characters = ''.join(sorted(node.children))
+        children = tuple(frozen.pop(id(node.children[char]))
+                         for char in characters)
+        signature = (node.terminal, characters,
+                     tuple(id(child) for child in children))
+        if signature not in register:
+            register[signature] = FrozenPrefixTreeNode(characters, children,
+                                                       node.terminal)
+        frozen[id(node)] = register[signature]
+    return frozen[id(root)]
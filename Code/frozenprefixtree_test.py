@@ -0,0 +1,61 @@
+#!python3
+
+from frozenprefixtree import FrozenPrefixTree
+from prefixtree import PrefixTree
+import unittest
+
+
+class FrozenPrefixTreeTest(unittest.TestCase):
+
+    def test_init_and_properties(self):
+        tree = FrozenPrefixTree()
+        assert tree.size == 0
+        assert tree.is_empty() is True
+        assert tree.root.is_terminal() is False
+        assert tree.root.num_children() == 0
+        assert tree.strings() == []
+
+    def test_freeze_shares_identical_suffixes(self):
+        tree = PrefixTree(['tap', 'taps', 'top', 'tops'])
+        frozen = tree.freeze()
+        assert frozen.size == 4
+        # Verify paths 'ta' and 'to' lead to the same shared node for 'p'
+        node_ta = frozen.root.get_child('t').get_child('a')
+        node_to = frozen.root.get_child('t').get_child('o')
+        assert node_ta is not None and node_to is not None
+        assert node_ta is node_to
+        # Minimal graph: root, 't', shared 'a'/'o', 'p', 's'
+        assert frozen.num_nodes() == 5
+        # Verify the original prefix tree is left unchanged
+        assert tree.size == 4
+        self.assertCountEqual(tree.strings(), ['tap', 'taps', 'top', 'tops'])
+
+    def test_contains(self):
+        tree = FrozenPrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.contains('ABC') is True
+        assert tree.contains('ABD') is True
+        assert tree.contains('A') is True
+        assert tree.contains('XYZ') is True
+        assert tree.contains('AB') is False
+        assert tree.contains('BC') is False
+        assert tree.contains('XY') is False
+        assert tree.contains('Z') is False
+
+    def test_complete(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ']
+        tree = PrefixTree(strings)
+        frozen = tree.freeze()
+        # Verify completions match the mutable prefix tree for all substrings
+        for prefix in ['ABC', 'ABD', 'AB', 'BC', 'BD', 'A', 'B', 'C', 'D',
+                       'XYZ', 'XY', 'YZ', 'X', 'Y', 'Z']:
+            assert frozen.complete(prefix) == tree.complete(prefix)
+
+    def test_strings(self):
+        strings = 'Shelly sells seashells by the sea shore'.split()
+        frozen = FrozenPrefixTree(strings)
+        assert frozen.strings() == sorted(set(strings))
+        assert frozen.size == len(set(strings))
+
+
+if __name__ == '__main__':
+    unittest.main()
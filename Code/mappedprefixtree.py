@@ -0,0 +1,237 @@
+#!python3
+
+from bytesprefixtree import BytesPrefixTreeNode
+import mmap
+import struct
+
+# File layout: a fixed header, a flat table of fixed-size node records in
+# depth-first pre-order, then a blob of UTF-8 encoded edge labels. Header
+# fields: magic bytes, format version, node count, string count, blob size.
+HEADER = struct.Struct('<4sHxxIII')
+MAGIC = b'PTRE'
+VERSION = 1
+# Node record fields: label offset and length in the label blob, flags, index
+# of the node's first child and index of its next sibling (or NO_NODE).
+NODE = struct.Struct('<IHHii')
+TERMINAL = 1
+NO_NODE = -1
+
+
+def save(tree, filename):
+    """Write the given prefix tree (or any tree of nodes with a character or
+    label and a dictionary of children, or of BytesPrefixTreeNode) to the
+    given file in the flat binary format that MappedPrefixTree reads.
+    Children are stored in sorted order."""
+    # Number the nodes in depth-first pre-order so each subtree is contiguous
+    nodes = []
+    labels = []
+    children = []
+    stack = [(b'', tree.root)]
+    while stack:
+        label, node = stack.pop()
+        nodes.append(node)
+        labels.append(label)
+        sorted_children = sorted(_labeled_children(node))
+        children.append(sorted_children)
+        stack.extend(reversed(sorted_children))
+    index_of = {id(node): index for index, node in enumerate(nodes)}
+    # Link each node to its first child and each child to its next sibling
+    first_child = [NO_NODE] * len(nodes)
+    next_sibling = [NO_NODE] * len(nodes)
+    for index, sorted_children in enumerate(children):
+        previous = NO_NODE
+        for _, child in sorted_children:
+            child_index = index_of[id(child)]
+            if previous == NO_NODE:
+                first_child[index] = child_index
+            else:
+                next_sibling[previous] = child_index
+            previous = child_index
+    # Store each distinct label once in the blob
+    offsets = {}
+    blob = bytearray()
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(nodes), tree.size, 0))
+        for index, node in enumerate(nodes):
+            label = labels[index]
+            if label not in offsets:
+                offsets[label] = len(blob)
+                blob += label
+            flags = TERMINAL if node.terminal else 0
+            file.write(NODE.pack(offsets[label], len(label), flags,
+                                 first_child[index], next_sibling[index]))
+        file.write(blob)
+        # Rewrite the header now that the blob size is known
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, len(nodes), tree.size,
+                               len(blob)))
+
+
+def _labeled_children(node) -> [(bytes, object)]:
+    """Return a list of (encoded edge label, child node) pairs of the given
+    node's children, for nodes with a dictionary of children or for
+    BytesPrefixTreeNode, whose children are indexed by byte value."""
+    if isinstance(node, BytesPrefixTreeNode):
+        return [(bytes((byte,)), child) for byte, child in node.items()]
+    return [(_encoded_label(child), child) for child in node.children.values()]
+
+
+def _encoded_label(node) -> bytes:
+    """Return the UTF-8 encoded edge label of the given node."""
+    label = getattr(node, 'label', None)
+    if label is None:
+        label = node.character
+    return label.encode('utf-8')
+
+
+class MappedPrefixTree:
+    """MappedPrefixTree: A read-only prefix tree that answers queries directly
+    from a file written by save, which is memory-mapped instead of read into
+    Python objects. Opening the file takes constant time regardless of the
+    number of strings stored, and processes that map the same file share its
+    pages in the operating system's cache. Strings are retrieved in sorted
+    order. Call close (or use a with statement) to unmap the file."""
+
+    def __init__(self, filename):
+        """Memory-map the given file and validate its header, or raise
+        ValueError if the file is not in the expected format."""
+        with open(filename, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise ValueError(f'File is too small: {filename!r}')
+        magic, version, num_nodes, size, blob_size = \
+            HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'Not a prefix tree file: {filename!r}')
+        self.num_nodes = num_nodes
+        # Count the number of complete words stored in the tree
+        self.size = size
+        # Offset of the label blob that follows the node table
+        self.labels_offset = HEADER.size + num_nodes * NODE.size
+        if len(self.buffer) < self.labels_offset + blob_size:
+            self.close()
+            raise ValueError(f'File is truncated: {filename!r}')
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'MappedPrefixTree({self.strings()!r})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file backing this prefix tree."""
+        self.buffer.close()
+
+    def is_empty(self) -> bool:
+        """Return True if this prefix tree is empty (contains no strings)."""
+        return self.size == 0
+
+    def _node(self, index: int) -> (bytes, int, int, int):
+        """Return a tuple of the label, flags, first child index and next
+        sibling index of the node record at the given index."""
+        offset, length, flags, first_child, next_sibling = NODE.unpack_from(
+            self.buffer, HEADER.size + index * NODE.size)
+        start = self.labels_offset + offset
+        return self.buffer[start:start + length], flags, first_child, \
+            next_sibling
+
+    def _find_prefix(self, prefix: bytes) -> (int, bytes):
+        """Return a tuple of the index of the highest node whose path from the
+        root starts with the given encoded prefix and the encoded string along
+        that path, or NO_NODE and the empty string if no path matches."""
+        node = 0
+        path = b''
+        while len(path) < len(prefix):
+            remaining = prefix[len(path):]
+            _, _, child, _ = self._node(node)
+            while child != NO_NODE:
+                label, _, _, next_sibling = self._node(child)
+                # The prefix may end partway along a multi-character label
+                if remaining.startswith(label) or label.startswith(remaining):
+                    break
+                # Siblings are sorted so no later label can match either
+                if label > remaining:
+                    child = NO_NODE
+                    break
+                child = next_sibling
+            if child == NO_NODE:
+                return NO_NODE, b''
+            node = child
+            path += label
+        return node, path
+
+    def contains(self, word: str) -> bool:
+        """Return True if this prefix tree contains the given string."""
+        encoded = word.encode('utf-8')
+        node, path = self._find_prefix(encoded)
+        if node == NO_NODE or path != encoded:
+            return False
+        _, flags, _, _ = self._node(node)
+        return bool(flags & TERMINAL)
+
+    def complete(self, word_or_prefix: str) -> [str]:
+        """Return a list of all strings stored in this prefix tree that start
+        with the given prefix string."""
+        completions = []
+        node, path = self._find_prefix(word_or_prefix.encode('utf-8'))
+        # case: prefix does not exist
+        if node == NO_NODE:
+            return completions
+        self._traverse(node, path, completions.append)
+        return completions
+
+    def strings(self) -> [str]:
+        """Return a list of all strings stored in this prefix tree."""
+        all_strings = []
+        self._traverse(0, b'', all_strings.append)
+        return all_strings
+
+    def _traverse(self, node: int, prefix: bytes, visit):
+        """Traverse the subtree below the node at the given index in sorted
+        order with an iterative depth-first traversal and visit each string
+        that terminates in it with the given function."""
+        _, flags, first_child, _ = self._node(node)
+        if flags & TERMINAL:
+            visit(prefix.decode('utf-8'))
+        # Stack of sibling nodes still to visit and the path length above them
+        stack = [(first_child, len(prefix))]
+        # Shared buffer of encoded characters on the path to the current node
+        path = bytearray(prefix)
+        while stack:
+            child, depth = stack.pop()
+            if child == NO_NODE:
+                continue
+            label, flags, first_child, next_sibling = self._node(child)
+            # Resume with this node's next sibling after its subtree is done
+            stack.append((next_sibling, depth))
+            del path[depth:]
+            path += label
+            if flags & TERMINAL:
+                visit(path.decode('utf-8'))
+            stack.append((first_child, len(path)))
+
+
+def main():
+    """Build a prefix tree from the given vocabulary file and save it to the
+    given output file for MappedPrefixTree to open."""
+    import sys
+    from autocomplete import iter_lines
+    from prefixtree import PrefixTree
+    if len(sys.argv) != 3:
+        script = sys.argv[0]
+        print(f'Usage: {script} vocabulary-file output-file')
+        print('Save a prefix tree of the vocabulary in memory-mappable format')
+        return
+    tree = PrefixTree(iter_lines(sys.argv[1]))
+    save(tree, sys.argv[2])
+    print(f'Saved {tree.size} strings to {sys.argv[2]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!python3
+
+from mappedprefixtree import MappedPrefixTree, save
+from prefixtree import PrefixTree
+from radixtree import RadixTree
+from bytesprefixtree import BytesPrefixTree
+import os
+import tempfile
+import unittest
+
+
+class MappedPrefixTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'tree.bin')
+
+    def mapped_tree(self, tree):
+        save(tree, self.filename)
+        mapped = MappedPrefixTree(self.filename)
+        self.addCleanup(mapped.close)
+        return mapped
+
+    def test_empty_tree(self):
+        mapped = self.mapped_tree(PrefixTree())
+        assert mapped.size == 0
+        assert mapped.is_empty() is True
+        assert mapped.num_nodes == 1
+        assert mapped.strings() == []
+        assert mapped.complete('A') == []
+        assert mapped.contains('') is False
+
+    def test_contains(self):
+        mapped = self.mapped_tree(PrefixTree(['ABC', 'ABD', 'A', 'XYZ']))
+        assert mapped.size == 4
+        assert mapped.contains('ABC') is True
+        assert mapped.contains('ABD') is True
+        assert mapped.contains('A') is True
+        assert mapped.contains('XYZ') is True
+        assert mapped.contains('AB') is False
+        assert mapped.contains('BC') is False
+        assert mapped.contains('XYZW') is False
+
+    def test_complete(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ']
+        tree = PrefixTree(strings)
+        mapped = self.mapped_tree(tree)
+        for prefix in ['ABC', 'ABD', 'AB', 'BC', 'BD', 'A', 'B', 'C', 'D',
+                       'XYZ', 'XY', 'YZ', 'X', 'Y', 'Z']:
+            assert mapped.complete(prefix) == tree.complete(prefix)
+
+    def test_unicode_strings_in_sorted_order(self):
+        strings = ['café', 'cafe', 'caffè', 'naïve', 'über', 'zebra']
+        mapped = self.mapped_tree(PrefixTree(strings))
+        assert mapped.strings() == sorted(strings)
+        assert mapped.complete('caf') == ['cafe', 'caffè', 'café']
+        assert mapped.contains('café') is True
+        assert mapped.contains('caf') is False
+
+    def test_radix_tree_labels(self):
+        strings = 'Shelly sells seashells by the sea shore'.split()
+        mapped = self.mapped_tree(RadixTree(strings))
+        assert mapped.strings() == sorted(set(strings))
+        # Verify prefixes that end partway along an edge label
+        assert mapped.complete('seas') == ['seashells']
+        assert mapped.complete('sh') == ['shore']
+        assert mapped.complete('sx') == []
+        assert mapped.contains('sea') is True
+        assert mapped.contains('seas') is False
+
+    def test_bytes_prefix_tree(self):
+        strings = ['café', 'cafe', 'caffè', 'naïve', 'A']
+        tree = BytesPrefixTree(strings)
+        mapped = self.mapped_tree(tree)
+        assert mapped.num_nodes == tree.num_nodes()
+        assert mapped.strings() == sorted(strings)
+        assert mapped.complete('caf') == ['cafe', 'caffè', 'café']
+        assert mapped.contains('naïve') is True
+        assert mapped.contains('naive') is False
+
+    def test_invalid_file(self):
+        with open(self.filename, 'wb') as file:
+            file.write(b'not a prefix tree file')
+        with self.assertRaises(ValueError):
+            MappedPrefixTree(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+#!python3
+
+from prefixtree import PrefixTree
+import unicodedata
+
+
+def normalize(string: str, strip_accents: bool = False) -> str:
+    """Return the key of the given string for case-insensitive matching: its
+    NFKC normal form case-folded, so that 'Straße', 'STRASSE' and 'strasse'
+    share a key, as do compatibility forms like the 'ﬁ' ligature and 'fi'.
+    If strip_accents is True, combining marks are also removed from the
+    canonically decomposed key, so that 'café' and 'cafe' share a key too."""
+    key = unicodedata.normalize('NFKC', string).casefold()
+    if strip_accents:
+        key = ''.join(character
+                      for character in unicodedata.normalize('NFKD', key)
+                      if not unicodedata.combining(character))
+    # Case folding can produce strings that are no longer in normal form
+    return unicodedata.normalize('NFKC', key)
+
+
+class NormalizedPrefixTree(PrefixTree):
+    """NormalizedPrefixTree: A prefix tree that stores each string under its
+    normalized key (see normalize) and returns the original strings, called
+    surface forms, from queries matched against normalized keys. All forms of
+    a string that differ only in case, compatibility characters or (with
+    strip_accents) accents share one path and subtree in the tree, so one
+    traversal completes a prefix case- and accent-insensitively, such as
+    'cafe' to both 'Café' and 'cafeteria'. Forms of the same key are returned
+    in the order they were inserted. Size counts distinct keys, and rank and
+    select index the sorted list of keys rather than of forms."""
+
+    def __init__(self, strings=None, children_type=None, strip_accents=False):
+        """Initialize this prefix tree and insert the given strings, if any,
+        stored under keys with accents removed if strip_accents is True."""
+        self.strip_accents = strip_accents
+        # Map of each normalized key to the list of its surface forms
+        self.surface_forms = {}
+        super().__init__(strings, children_type)
+
+    @classmethod
+    def from_sorted(cls, strings, children_type=None, strip_accents=False):
+        """Return a new prefix tree of the given strings. Normalization does
+        not preserve sorted order, so each string is inserted in turn."""
+        return cls(strings, children_type, strip_accents)
+
+    def __repr__(self):
+        """Return a string representation of this prefix tree."""
+        return f'NormalizedPrefixTree({self.strings()!r})'
+
+    def normalize(self, string: str) -> str:
+        """Return the key that the given string is stored under."""
+        return normalize(string, self.strip_accents)
+
+    def _surface(self, keys) -> [str]:
+        """Return a list of the surface forms of each of the given keys."""
+        surface_forms = self.surface_forms
+        return [form for key in keys for form in surface_forms[key]]
+
+    def contains(self, word: str) -> bool:
+        """Return True if this prefix tree contains a string with the same
+        normalized key as the given string."""
+        return super().contains(self.normalize(word))
+
+    def contains_many(self, words) -> [bool]:
+        """Return a list of booleans that are True where this prefix tree
+        contains a string with the same key as the string at that position."""
+        return super().contains_many(self.normalize(word) for word in words)
+
+    def insert(self, word: str, weight=None):
+        """Insert the given string into this prefix tree under its normalized
+        key with the given weight, which is shared by all forms of the key."""
+        key = self.normalize(word)
+        super().insert(key, weight)
+        forms = self.surface_forms.setdefault(key, [])
+        if word not in forms:
+            forms.append(word)
+            # A new form changes completions even if its key was stored
+            self.version += 1
+
+    def delete(self, word: str):
+        """Remove the given surface form from this prefix tree, or raise
+        ValueError if it is not stored in it. Its key is removed along with
+        the last of its forms."""
+        key = self.normalize(word)
+        forms = self.surface_forms.get(key)
+        if forms is None or word not in forms:
+            raise ValueError(f'String not found: {word!r}')
+        forms.remove(word)
+        if forms:
+            # Other forms keep the key, but completions still change
+            self.version += 1
+        else:
+            del self.surface_forms[key]
+            super().delete(key)
+
+    def count_prefix(self, word_or_prefix: str) -> int:
+        """Return the number of keys stored in this prefix tree that start
+        with the normalized key of the given prefix string."""
+        return super().count_prefix(self.normalize(word_or_prefix))
+
+    def rank(self, word: str) -> int:
+        """Return the number of keys stored in this prefix tree that come
+        before the normalized key of the given string in sorted order."""
+        return super().rank(self.normalize(word))
+
+    def select(self, index: int) -> str:
+        """Return the first inserted surface form of the key at the given
+        index in the sorted list of all keys stored in this prefix tree, or
+        raise IndexError if the index is out of range."""
+        return self.surface_forms[super().select(index)][0]
+
+    def complete(self, word_or_prefix: str) -> [str]:
+        """Return a list of all surface forms stored in this prefix tree whose
+        keys start with the normalized key of the given prefix string."""
+        return self._surface(super().complete(self.normalize(word_or_prefix)))
+
+    def complete_many(self, prefixes) -> [[str]]:
+        """Return a list of lists of all surface forms stored in this prefix
+        tree whose keys start with each of the given prefixes' keys."""
+        all_keys = super().complete_many(
+            self.normalize(prefix) for prefix in prefixes)
+        return [self._surface(keys) for keys in all_keys]
+
+    def complete_fuzzy(self, word_or_prefix: str, max_edits: int) -> [str]:
+        """Return a list of all surface forms stored in this prefix tree whose
+        keys start with a prefix within the given maximum number of edits of
+        the normalized key of the given prefix."""
+        return self._surface(super().complete_fuzzy(
+            self.normalize(word_or_prefix), max_edits))
+
+    def complete_top_k(self, word_or_prefix: str, k: int) -> [str]:
+        """Return a list of the k surface forms with the highest weights whose
+        keys start with the normalized key of the given prefix string."""
+        keys = super().complete_top_k(self.normalize(word_or_prefix), k)
+        return self._surface(keys)[:max(k, 0)]
+
+    def strings(self) -> [str]:
+        """Return a list of all surface forms stored in this prefix tree."""
+        return self._surface(super().strings())
+
+    def iter_complete(self, word_or_prefix: str):
+        """Return a generator that yields all surface forms whose keys start
+        with the given prefix's key, in lexicographic order of their keys."""
+        surface_forms = self.surface_forms
+        return (form
+                for key in super().iter_complete(self.normalize(word_or_prefix))
+                for form in surface_forms[key])
+
+    def iter_strings(self):
+        """Return a generator that yields all surface forms stored in this
+        prefix tree in lexicographic order of their keys."""
+        surface_forms = self.surface_forms
+        return (form for key in super().iter_strings()
+                for form in surface_forms[key])
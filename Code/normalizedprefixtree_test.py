@@ -0,0 +1,123 @@
+#!python
+
+from normalizedprefixtree import NormalizedPrefixTree, normalize
+import unittest
+
+
+class NormalizeTest(unittest.TestCase):
+
+    def test_normalize_case(self):
+        assert normalize('Apple') == 'apple'
+        assert normalize('STRASSE') == normalize('Straße') == 'strasse'
+
+    def test_normalize_compatibility_forms(self):
+        # Ligature and fullwidth letters have plain compatibility forms
+        assert normalize('ﬁne') == 'fine'
+        assert normalize('ＡＢ') == 'ab'
+
+    def test_normalize_composed_and_decomposed(self):
+        composed = 'café'
+        decomposed = 'café'
+        assert normalize(composed) == normalize(decomposed) == composed
+        assert normalize('Café') != 'cafe'
+
+    def test_normalize_strip_accents(self):
+        assert normalize('Café', strip_accents=True) == 'cafe'
+        assert normalize('café', strip_accents=True) == 'cafe'
+        assert normalize('Ångström', strip_accents=True) == 'angstrom'
+
+
+class NormalizedPrefixTreeTest(unittest.TestCase):
+
+    def test_complete_returns_surface_forms(self):
+        tree = NormalizedPrefixTree(['Apple', 'apple', 'APPLET', 'Banana'])
+        assert tree.size == 3
+        assert tree.complete('app') == ['Apple', 'apple', 'APPLET']
+        assert tree.complete('APP') == ['Apple', 'apple', 'APPLET']
+        assert tree.complete('b') == ['Banana']
+        assert tree.complete('c') == []
+        assert tree.strings() == ['Apple', 'apple', 'APPLET', 'Banana']
+
+    def test_contains(self):
+        tree = NormalizedPrefixTree(['Straße'])
+        assert tree.contains('strasse')
+        assert tree.contains('STRASSE')
+        assert not tree.contains('strass')
+        assert tree.contains_many(['Straße', 'x', 'STRASSE']) == \
+            [True, False, True]
+
+    def test_subtrees_are_shared(self):
+        tree = NormalizedPrefixTree(['Apple', 'APPLE', 'apple'])
+        # Only one path of nodes is stored for all three forms
+        assert tree.root.num_children() == 1
+        assert tree.root.count == 1
+        assert tree.count_prefix('A') == 1
+
+    def test_strip_accents(self):
+        words = ['Café', 'cafe', 'cafeteria', 'Cafè']
+        tree = NormalizedPrefixTree(words)
+        assert tree.complete('cafe') == ['cafe', 'cafeteria']
+        tree = NormalizedPrefixTree(words, strip_accents=True)
+        assert tree.complete('CAFE') == ['Café', 'cafe', 'Cafè', 'cafeteria']
+        assert tree.complete('café') == ['Café', 'cafe', 'Cafè', 'cafeteria']
+
+    def test_delete(self):
+        tree = NormalizedPrefixTree(['Apple', 'apple'])
+        tree.delete('Apple')
+        assert tree.complete('a') == ['apple']
+        assert tree.contains('APPLE')
+        with self.assertRaises(ValueError):
+            tree.delete('APPLE')
+        tree.delete('apple')
+        assert tree.is_empty()
+        assert not tree.contains('apple')
+        assert tree.surface_forms == {}
+
+    def test_repeated_insert(self):
+        tree = NormalizedPrefixTree(['Apple', 'Apple'])
+        assert tree.strings() == ['Apple']
+
+    def test_complete_top_k(self):
+        tree = NormalizedPrefixTree()
+        tree.insert('Apple', 1)
+        tree.insert('apple')
+        tree.insert('Apricot', 5)
+        tree.insert('avocado', 3)
+        assert tree.complete_top_k('A', 2) == ['Apricot', 'avocado']
+        assert tree.complete_top_k('a', 4) == \
+            ['Apricot', 'avocado', 'Apple', 'apple']
+        assert tree.complete_top_k('a', 0) == []
+
+    def test_iter_complete_and_iter_strings(self):
+        tree = NormalizedPrefixTree(['banana', 'Apple', 'APPLE', 'apricot'])
+        assert list(tree.iter_complete('AP')) == ['Apple', 'APPLE', 'apricot']
+        assert list(tree.iter_strings()) == \
+            ['Apple', 'APPLE', 'apricot', 'banana']
+
+    def test_complete_many_and_fuzzy(self):
+        tree = NormalizedPrefixTree(['Apple', 'Banana'])
+        assert tree.complete_many(['A', 'b', 'c']) == \
+            [['Apple'], ['Banana'], []]
+        assert tree.complete_fuzzy('APLE', 1) == ['Apple']
+
+    def test_rank_and_select(self):
+        tree = NormalizedPrefixTree(['apple', 'Banana', 'banana', 'Cherry'])
+        # Forms of the same key have the same rank
+        assert tree.rank('Banana') == tree.rank('banana') == 1
+        assert tree.rank('BANANA') == 1
+        assert tree.rank('cherry') == 2
+        assert tree.rank('zebra') == 3
+        # Select returns the first inserted form of the key at an index
+        assert [tree.select(index) for index in range(3)] == \
+            ['apple', 'Banana', 'Cherry']
+        with self.assertRaises(IndexError):
+            tree.select(3)
+
+    def test_from_sorted(self):
+        tree = NormalizedPrefixTree.from_sorted(['Zebra', 'apple'])
+        assert tree.complete('z') == ['Zebra']
+        assert sorted(tree.strings()) == ['Zebra', 'apple']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!python3
+
+from compactprefixtree import CompactPrefixTree
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+
+def partition_by_range(strings, num_parts: int) -> [[str]]:
+    """Return a list of at most the given number of lists of the given
+    strings, split into contiguous ranges of first characters with about the
+    same number of strings in each, in order of their ranges. Strings in
+    different lists never share a first character."""
+    if num_parts < 1:
+        raise ValueError(f'Invalid number of parts: {num_parts!r}')
+    # Group strings by first character (the empty string sorts first)
+    groups = {}
+    for string in strings:
+        first = string[:1]
+        group = groups.get(first)
+        if group is None:
+            groups[first] = group = []
+        group.append(string)
+    total = sum(len(group) for group in groups.values())
+    parts = []
+    part = []
+    count = 0
+    for first in sorted(groups):
+        part.extend(groups[first])
+        count += len(groups[first])
+        # Close this part once it reaches its share of all strings so far
+        if count * num_parts >= total * (len(parts) + 1) and \
+                len(parts) < num_parts - 1:
+            parts.append(part)
+            part = []
+    if part:
+        parts.append(part)
+    return parts
+
+
+def _build_compact_part(strings):
+    """Return the arrays and size of a compact prefix tree of the given
+    strings, built in a worker process and sent back to be merged."""
+    tree = CompactPrefixTree(strings)
+    return (tree.labels, tree.first_child, tree.next_sibling, tree.terminal,
+            tree.size)
+
+
+def build_compact_prefix_tree(strings, num_workers=None) -> CompactPrefixTree:
+    """Return a compact prefix tree of the given strings built in parallel
+    with the given number of worker processes, or one per CPU if None. The
+    strings are split by ranges of first characters, a compact prefix tree
+    of each range is built in a worker process, and their parallel arrays are
+    appended to one tree with each range's nodes linked under its root. Only
+    shifting node indices is done in this process, so build time scales with
+    the number of workers."""
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if num_workers < 1:
+        raise ValueError(f'Invalid number of workers: {num_workers!r}')
+    # case: no workers to share the work with, so skip copying it to one
+    if num_workers == 1:
+        return CompactPrefixTree(strings)
+    parts = partition_by_range(strings, num_workers)
+    with ProcessPoolExecutor(min(num_workers, max(len(parts), 1))) as pool:
+        return _merge_compact_parts(pool.map(_build_compact_part, parts))
+
+
+def _merge_compact_parts(parts) -> CompactPrefixTree:
+    """Return a compact prefix tree of the arrays of the given compact prefix
+    trees of strings with disjoint first characters, in order of character."""
+    NO_NODE = CompactPrefixTree.NO_NODE
+    tree = CompactPrefixTree()
+    # Terminal bits of all nodes as one integer, merged with big int shifts
+    terminal_bits = 0
+    # Last child of the root so far, to link the next range's children to
+    last_root_child = NO_NODE
+    for labels, first_child, next_sibling, terminal, size in parts:
+        # Node i > 0 of this part becomes node i + shift of the merged tree,
+        # since every part's root node is merged into the single root node
+        shift = len(tree.labels) - 1
+        tree.labels.extend(labels[1:])
+        tree.first_child.extend(
+            [NO_NODE if node == NO_NODE else node + shift
+             for node in first_child[1:]])
+        tree.next_sibling.extend(
+            [NO_NODE if node == NO_NODE else node + shift
+             for node in next_sibling[1:]])
+        bits = int.from_bytes(terminal, 'little')
+        # The root terminates the empty string, if any range stored it
+        terminal_bits |= bits & 1
+        terminal_bits |= (bits >> 1) << (shift + 1)
+        tree.size += size
+        # Link this range's first root child after the previous range's last
+        child = first_child[CompactPrefixTree.ROOT]
+        if child == NO_NODE:
+            continue
+        child += shift
+        if last_root_child == NO_NODE:
+            tree.first_child[CompactPrefixTree.ROOT] = child
+        else:
+            tree.next_sibling[last_root_child] = child
+        while tree.next_sibling[child] != NO_NODE:
+            child = tree.next_sibling[child]
+        last_root_child = child
+    tree.terminal = bytearray(terminal_bits.to_bytes(
+        (len(tree.labels) + 7) >> 3, 'little'))
+    return tree
@@ -0,0 +1,72 @@
+#!python
+
+from parallelbuild import build_compact_prefix_tree, partition_by_range
+from compactprefixtree import CompactPrefixTree
+import random
+import string
+import unittest
+
+
+class PartitionByRangeTest(unittest.TestCase):
+
+    def test_partition_by_range(self):
+        strings = ['banana', 'apple', 'cherry', 'axle', 'date', 'bean', '']
+        parts = partition_by_range(strings, 3)
+        assert len(parts) <= 3
+        assert sorted(string for part in parts for string in part) == \
+            sorted(strings)
+        # Ranges are in order and no first character is in two parts
+        firsts = [sorted(set(string[:1] for string in part)) for part in parts]
+        for previous, following in zip(firsts, firsts[1:]):
+            assert previous[-1] < following[0]
+
+    def test_partition_by_range_more_parts_than_characters(self):
+        parts = partition_by_range(['ab', 'ac', 'ad'], 4)
+        assert parts == [['ab', 'ac', 'ad']]
+        assert partition_by_range([], 4) == []
+
+    def test_partition_by_range_invalid(self):
+        with self.assertRaises(ValueError):
+            partition_by_range(['a'], 0)
+
+
+class BuildCompactPrefixTreeTest(unittest.TestCase):
+
+    def assert_same_tree(self, tree, expected):
+        assert tree.size == expected.size
+        assert tree.num_nodes() == expected.num_nodes()
+        assert tree.strings() == expected.strings()
+
+    def test_build_matches_serial(self):
+        rand = random.Random(0)
+        strings = [''.join(rand.choice(string.ascii_lowercase[:6])
+                           for _ in range(rand.randint(1, 6)))
+                   for _ in range(500)] + ['']
+        expected = CompactPrefixTree(strings)
+        for num_workers in [1, 2, 3]:
+            tree = build_compact_prefix_tree(strings, num_workers)
+            self.assert_same_tree(tree, expected)
+            for prefix in ['', 'a', 'ab', 'fed', 'z']:
+                assert tree.complete(prefix) == expected.complete(prefix)
+            for word in strings[:50] + ['zz', 'abcdefg']:
+                assert tree.contains(word) == expected.contains(word)
+
+    def test_build_can_insert_after_merge(self):
+        tree = build_compact_prefix_tree(['axle', 'math', 'banana'], 2)
+        tree.insert('apple')
+        tree.insert('zebra')
+        assert tree.strings() == ['apple', 'axle', 'banana', 'math', 'zebra']
+        assert tree.size == 5
+
+    def test_build_empty(self):
+        tree = build_compact_prefix_tree([], 2)
+        assert tree.is_empty()
+        assert tree.strings() == []
+
+    def test_build_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            build_compact_prefix_tree(['a'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
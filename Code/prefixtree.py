@@ -1,6 +1,7 @@
 #!python3
 
 from prefixtreenode import PrefixTreeNode
+import heapq
 
 
 class PrefixTree:
@@ -18,17 +19,85 @@ class PrefixTree:
     # Constant for the start character stored in the prefix tree's root node
     START_CHARACTER = ''
 
-    def __init__(self, strings=None):
-        """Initialize this prefix tree and insert the given strings, if any."""
+    def __init__(self, strings=None, children_type=None):
+        """Initialize this prefix tree and insert the given strings, if any.
+        Each node stores its children in a structure of the given type, such
+        as SortedChildren or AlphabetChildren from prefixtreechildren to
+        retrieve strings in sorted order, or PrefixTreeNode.CHILDREN_TYPE."""
+        # Type of structure each node stores its children nodes in
+        self.children_type = children_type
         # Create a new root node with the start character
-        self.root = PrefixTreeNode(PrefixTree.START_CHARACTER)
+        self.root = PrefixTreeNode(PrefixTree.START_CHARACTER, children_type)
         # Count the number of complete words inserted into the tree
         self.size = 0
+        # Incremented whenever the strings or weights stored change, so that
+        # caches of query results can tell when they are out of date
+        self.version = 0
         # Insert each string, if any were given
         if strings is not None:
             for string in strings:
                 self.insert(string)
 
+    @classmethod
+    def from_sorted(cls, strings, children_type=None):
+        """Return a new prefix tree built from the given strings in sorted
+        order in a single pass, or raise ValueError if they are not sorted.
+        Each string shares a prefix with the string before it, so the path of
+        nodes to the previous string is kept and only new nodes are created
+        below the longest common prefix, without searching the tree at all.
+        A node's subtree is complete once it leaves the path, so its count is
+        added to its parent's then, instead of walking the whole path again
+        for every string. Every node built leads to a string of weight 0, so
+        0 is the maximum weight of each subtree. Creating nodes takes most of
+        the time either way, so this is only about as fast as inserting each
+        string for short strings that share little of their prefixes, but it
+        is faster for long strings with long common prefixes, which insert
+        searches again for every string (see prefixtree_benchmark)."""
+
+        tree = cls(children_type=children_type)
+        # Nodes along the path from the root to the end of the previous string
+        path = [tree.root]
+        previous = ''
+
+        for word in strings:
+            if word < previous:
+                raise ValueError(f'Strings are not sorted: {previous!r} '
+                                 f'comes before {word!r}')
+            # Find the length of the common prefix with previous string
+            common = 0
+            for letter, previous_letter in zip(word, previous):
+                if letter != previous_letter:
+                    break
+                common += 1
+            # Go back up the path to the node at end of common prefix, adding
+            # the count of each completed subtree to its parent's count
+            while len(path) > common + 1:
+                child = path.pop()
+                path[-1].count += child.count
+            node = path[-1]
+            # Sorted order means every letter after common prefix is new
+            for letter in word[common:]:
+                new_child_node = PrefixTreeNode(letter, children_type)
+                new_child_node.max_weight = 0
+                node.children[letter] = new_child_node
+                node = new_child_node
+                path.append(node)
+            # case: word is not a repeat of the previous string
+            if not node.terminal:
+                node.terminal = True
+                node.count += 1
+                tree.size += 1
+            previous = word
+
+        # Add the counts along the last string's path up to the root
+        while len(path) > 1:
+            child = path.pop()
+            path[-1].count += child.count
+        if tree.size > 0:
+            tree.root.max_weight = 0
+            tree.version += 1
+        return tree
+
     def __repr__(self):
         """Return a string representation of this prefix tree."""
         return f'PrefixTree({self.strings()!r})'
@@ -50,29 +119,116 @@ class PrefixTree:
 
         return False
 
-    def insert(self, word: str):
-        """Insert the given string into this prefix tree."""
-
-        node, _ = self._find_node(word)
-
-        # case: node already exists & is a terminal
-        if node and node.terminal:
-            return
+    def insert(self, word: str, weight=None):
+        """Insert the given string into this prefix tree with the given weight
+        for ranking completions, or with weight 0 if none is given. Inserting
+        a string that is already stored only updates its weight, if given."""
 
         node = self.root
+        # Nodes along the path from the root to the end of the word
+        path = [node]
 
         for letter in word:
             # case: if the letter does not exist as a child from current node
             if letter not in node.children:
                 # add child node to current node
-                new_child_node = PrefixTreeNode(letter)
+                new_child_node = PrefixTreeNode(letter, self.children_type)
                 node.add_child(letter, new_child_node)
             # traverse down
             node = node.children[letter]
+            path.append(node)
+
+        # case: node already exists & is a terminal
+        if node.terminal:
+            if weight is not None and weight != node.weight:
+                node.weight = weight
+                self._update_max_weights(path)
+                self.version += 1
+            return
+
         # set node terminal to True at the end of word iteration
+        self._add_terminal(path, 0 if weight is None else weight)
+
+    def _add_terminal(self, path: [PrefixTreeNode], weight):
+        """Mark the last node on the given path from the root as terminating a
+        new string with the given weight and count the string in this tree."""
+
+        node = path[-1]
         node.terminal = True
+        node.weight = weight
+        for path_node in path:
+            path_node.count += 1
+        # Raise the maximum subtree weight of each node on the path as needed
+        for path_node in reversed(path):
+            if path_node.max_weight >= weight:
+                break
+            path_node.max_weight = weight
 
         self.size += 1
+        self.version += 1
+
+    def delete(self, word: str):
+        """Remove the given string from this prefix tree, or raise ValueError
+        if it is not stored in it. Nodes left with no children that do not
+        terminate another string are pruned from the bottom of the path up."""
+
+        node = self.root
+        # Nodes along the path from the root to the end of the word
+        path = [node]
+
+        for letter in word:
+            node = node.children.get(letter)
+            if node is None:
+                break
+            path.append(node)
+
+        if node is None or not node.terminal:
+            raise ValueError(f'String not found: {word!r}')
+
+        node.terminal = False
+        node.weight = 0
+        for path_node in path:
+            path_node.count -= 1
+        self.size -= 1
+        self.version += 1
+
+        # Prune the chain of nodes that no longer lead to any string
+        while len(path) > 1 and not path[-1].terminal and not path[-1].children:
+            child = path.pop()
+            del path[-1].children[child.character]
+
+        self._update_max_weights(path)
+
+    def compact(self):
+        """Reclaim memory after many strings have been deleted from this prefix
+        tree by pruning any nodes that do not lead to a string and rebuilding
+        each node's children structure, since a dictionary keeps the space it
+        grew to even after items are removed from it."""
+
+        # Post-order traversal so each node's children are compacted first
+        stack = [(self.root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+                continue
+            children = type(node.children)()
+            for character, child in node.children.items():
+                if child.terminal or child.children:
+                    children[character] = child
+            node.children = children
+
+    def _update_max_weights(self, path: [PrefixTreeNode]):
+        """Recompute the maximum subtree weight of each node on the given path
+        from the root, starting from the bottom, after a weight has changed."""
+
+        for node in reversed(path):
+            max_weight = node.weight if node.terminal else float('-inf')
+            for child in node.children.values():
+                if child.max_weight > max_weight:
+                    max_weight = child.max_weight
+            node.max_weight = max_weight
 
     def _find_node(self, word: str) -> (object, int):
         """Return a tuple containing the node that terminates the given string
@@ -88,14 +244,120 @@ class PrefixTree:
             return node, depth
 
         for char in word:
-            if char in node.children:
-                node = node.children[char]
-                depth += 1
-            else:
-                node = None
+            node = node.children.get(char)
+            if node is None:
                 break
+            depth += 1
         return node, depth
 
+    def contains_many(self, words) -> [bool]:
+        """Return a list of booleans that are True where this prefix tree
+        contains the string at the same position in the given strings."""
+
+        return [node is not None and node.terminal
+                for node in self._find_many(words)]
+
+    def _find_many(self, words) -> [PrefixTreeNode]:
+        """Return a list of the nodes that terminate each of the given strings
+        in this prefix tree, in the same order, with None for each string that
+        is not completely found. Strings are searched in sorted order so each
+        search starts from the node reached by the longest common prefix with
+        the previous string, instead of from the root node every time."""
+
+        words = list(words)
+        nodes = [None] * len(words)
+        # Nodes along the path matched by the previous string
+        path = [self.root]
+        previous = ''
+
+        for index in sorted(range(len(words)), key=words.__getitem__):
+            word = words[index]
+            # Find the length of the common prefix with the previous string,
+            # which is at most the depth reached by the previous search
+            limit = len(path) - 1
+            # case: word extends the previous string, as in 'mate', 'mater'
+            if word.startswith(previous):
+                common = min(len(previous), limit)
+            else:
+                common = 0
+                for letter, previous_letter in zip(word, previous):
+                    if common == limit or letter != previous_letter:
+                        break
+                    common += 1
+            # Go back up the path to the node at the end of the common prefix
+            del path[common + 1:]
+            node = path[-1]
+            for letter in word[common:]:
+                node = node.children.get(letter)
+                if node is None:
+                    break
+                path.append(node)
+            nodes[index] = node
+            previous = word
+
+        return nodes
+
+    def count_prefix(self, word_or_prefix: str) -> int:
+        """Return the number of strings stored in this prefix tree that start
+        with the given prefix string, using the count of strings stored on
+        each node so that no strings need to be retrieved."""
+
+        node, _ = self._find_node(word_or_prefix)
+
+        # case: prefix does not exist
+        if node is None:
+            return 0
+
+        return node.count
+
+    def rank(self, word: str) -> int:
+        """Return the number of strings stored in this prefix tree that come
+        before the given string in lexicographic order, which is the index the
+        given string has or would have in the sorted list of all strings."""
+
+        rank = 0
+        node = self.root
+
+        for letter in word:
+            # The string ending at this node is a prefix so it comes before
+            if node.terminal:
+                rank += 1
+            # Count all strings below children with smaller characters
+            for character, child in node.children.items():
+                if character < letter:
+                    rank += child.count
+            node = node.children.get(letter)
+            if node is None:
+                break
+
+        return rank
+
+    def select(self, index: int) -> str:
+        """Return the string at the given index in the lexicographically sorted
+        list of all strings stored in this prefix tree, or raise IndexError if
+        the index is out of range. Uses the count of strings stored on each
+        node to skip whole subtrees instead of retrieving their strings."""
+
+        if not 0 <= index < self.size:
+            raise IndexError(f'Index out of range: {index}')
+
+        node = self.root
+        path = []
+
+        while True:
+            if node.terminal:
+                # case: the string ending at this node is the one at index
+                if index == 0:
+                    return ''.join(path)
+                index -= 1
+            for character, child in self._sorted_children(node):
+                # case: the string at index is below this child
+                if index < child.count:
+                    path.append(character)
+                    node = child
+                    break
+                index -= child.count
+
     def complete(self, word_or_prefix: str) -> [str]:
         """Return a list of all strings stored in this prefix tree that start
         with the given prefix string."""
@@ -110,14 +372,91 @@ class PrefixTree:
         if node is None:
             return completions
 
-        # case: word_or_string is already a completed word
-        if node.is_terminal():
-            completions.append(word_or_prefix)
-
         # traverse through prefix tree & append all terminal words
-        for child in node.children.values():
-            self._traverse(child, word_or_prefix +
-                           child.character, completions.append)
+        self._traverse(node, word_or_prefix, completions.append)
+
+        return completions
+
+    def complete_many(self, prefixes) -> [[str]]:
+        """Return a list of lists of all strings stored in this prefix tree
+        that start with each of the given prefix strings, in the same order.
+        Searches for the prefixes share traversal work as in contains_many."""
+
+        prefixes = list(prefixes)
+        all_completions = []
+
+        for prefix, node in zip(prefixes, self._find_many(prefixes)):
+            completions = []
+            # case: prefix exists so append all terminal words below it
+            if node is not None:
+                self._traverse(node, prefix, completions.append)
+            all_completions.append(completions)
+
+        return all_completions
+
+    def complete_fuzzy(self, word_or_prefix: str, max_edits: int) -> [str]:
+        """Return a list of all strings stored in this prefix tree that start
+        with a prefix within the given maximum number of edits (insertions,
+        deletions or substitutions of one character) of the given prefix.
+        Each node on the search path keeps one row of the Levenshtein distance
+        table between its path string and the given prefix, computed from its
+        parent's row, and subtrees whose row minimum exceeds max_edits are
+        skipped since the distance can only grow further down the tree."""
+
+        completions = []
+        length = len(word_or_prefix)
+
+        # Stack of nodes to search with their path strings and distance rows
+        stack = [(self.root, '', list(range(length + 1)))]
+        while stack:
+            node, path, row = stack.pop()
+            # case: this node's path is close enough to the prefix, so every
+            # string below it is a completion and no deeper path is needed
+            if row[length] <= max_edits:
+                self._traverse(node, path, completions.append)
+                continue
+            for child in node.children.values():
+                character = child.character
+                child_row = [row[0] + 1]
+                for index in range(1, length + 1):
+                    cost = word_or_prefix[index - 1] != character
+                    child_row.append(min(child_row[index - 1] + 1,
+                                         row[index] + 1,
+                                         row[index - 1] + cost))
+                # case: some alignment can still end within max_edits
+                if min(child_row) <= max_edits:
+                    stack.append((child, path + character, child_row))
+
+        return completions
+
+    def complete_top_k(self, word_or_prefix: str, k: int) -> [str]:
+        """Return a list of the k strings with the highest weights stored in
+        this prefix tree that start with the given prefix string, ordered by
+        descending weight and then lexicographically. Uses best-first search
+        with a heap of nodes keyed by their maximum subtree weight, so only the
+        parts of the subtree that can contain a top result are explored."""
+
+        completions = []
+
+        node, _ = self._find_node(word_or_prefix)
+
+        # case: prefix does not exist
+        if node is None or k <= 0:
+            return completions
+
+        # Heap items are (negated weight, string, kind, node) where kind 0 is
+        # a completed string and kind 1 is a subtree still to be expanded
+        heap = [(-node.max_weight, word_or_prefix, 1, node)]
+        while heap and len(completions) < k:
+            _, string, kind, node = heapq.heappop(heap)
+            if kind == 0:
+                completions.append(string)
+                continue
+            if node.is_terminal():
+                heapq.heappush(heap, (-node.weight, string, 0, None))
+            for child in node.children.values():
+                heapq.heappush(heap, (-child.max_weight,
+                                      string + child.character, 1, child))
 
         return completions
 
@@ -126,23 +465,92 @@ class PrefixTree:
 
         all_strings = list()
 
-        for child in self.root.children.values():
-            if child is not None:
-                self._traverse(child, child.character, all_strings.append)
+        self._traverse(self.root, '', all_strings.append)
         return all_strings
 
-    def _traverse(self, node: object, prefix: str, visit):
-        """Traverse this prefix tree with recursive depth-first traversal.
-        Start at the given node and visit each node with the given function."""
+    def iter_complete(self, word_or_prefix: str):
+        """Return a generator that yields all strings stored in this prefix
+        tree that start with the given prefix string in lexicographic order,
+        one at a time as they are found, so callers can stop early."""
+
+        node, _ = self._find_node(word_or_prefix)
+
+        # case: prefix does not exist
+        if node is None:
+            return iter(())
+
+        return self._iter_traverse(node, word_or_prefix)
+
+    def iter_strings(self):
+        """Return a generator that yields all strings stored in this prefix
+        tree in lexicographic order, one at a time as they are found."""
+
+        return self._iter_traverse(self.root, '')
+
+    def _iter_traverse(self, node: PrefixTreeNode, prefix: str,
+                       ordered: bool = True):
+        """Generate each string that terminates in the subtree below the given
+        node, whose path from the root spells the given prefix, in depth-first
+        pre-order, visiting children in lexicographic order if ordered is True
+        or in their stored order if not. Uses an explicit stack of children
+        iterators instead of recursion so very long strings cannot exceed the
+        recursion limit, and a shared buffer of the characters on the current
+        path that is only joined into a string at terminal nodes."""
 
-        # execute visit if it is terminal
         if node.is_terminal():
-            # visit(prefix + node.character)
-            visit(prefix)
+            yield prefix
+
+        # Shared buffer of the characters on the path to the current node
+        path = list(prefix)
+        # Stack of iterators over the children of each node on the path
+        stack = [self._iter_children(node, ordered)]
+        while stack:
+            for child in stack[-1]:
+                path.append(child.character)
+                if child.terminal:
+                    yield ''.join(path)
+                # case: descend into this child before its next sibling
+                if child.children:
+                    stack.append(self._iter_children(child, ordered))
+                    break
+                path.pop()
+            else:
+                # case: all children at this depth are done so go back up
+                stack.pop()
+                if stack:
+                    path.pop()
+
+    def _iter_children(self, node: PrefixTreeNode, ordered: bool):
+        """Return an iterator over the given node's children nodes, sorted by
+        character if ordered is True or in their stored order if not."""
 
-        for child_node in node.children.values():
-            # concat chars
-            self._traverse(child_node, prefix + child_node.character, visit)
+        if ordered and not getattr(node.children, 'ORDERED', False):
+            return iter([child for _, child in self._sorted_children(node)])
+        return iter(node.children.values())
+
+    def _sorted_children(self, node: PrefixTreeNode):
+        """Return an iterable of (character, child node) pairs of the given
+        node's children in sorted order by character. Structures of children
+        that are already ordered are iterated without sorting them again."""
+
+        children = node.children
+        if getattr(children, 'ORDERED', False):
+            return children.items()
+        return sorted(children.items(), key=lambda item: item[0])
+
+    def _traverse(self, node: object, prefix: str, visit):
+        """Traverse this prefix tree with iterative depth-first traversal.
+        Start at the given node and visit each string with the given function."""
+
+        for string in self._iter_traverse(node, prefix, ordered=False):
+            visit(string)
+
+    def freeze(self):
+        """Return an immutable FrozenPrefixTree that stores the same strings as
+        this prefix tree, compiled into a minimal directed acyclic word graph
+        that shares identical suffix subtrees to use less memory."""
+        from frozenprefixtree import FrozenPrefixTree
+        return FrozenPrefixTree.from_tree(self)
 
 
 def create_prefix_tree(strings):
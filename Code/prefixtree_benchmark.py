@@ -0,0 +1,291 @@
+#!python3
+
+from prefixtree import PrefixTree
+from prefixtreechildren import SortedChildren, AlphabetChildren, BitmapChildren
+from ternarysearchtree import TernarySearchTree
+from sortedarray import SortedArray
+from compactprefixtree import CompactPrefixTree
+from parallelbuild import build_compact_prefix_tree
+from bytesprefixtree import BytesPrefixTree
+import gc
+import random
+import string
+import time
+import tracemalloc
+
+
+def random_words(count, min_length=3, max_length=12, seed=0):
+    """Return a list of the given number of random lowercase words with
+    lengths between the given minimum and maximum, using the given seed."""
+    rand = random.Random(seed)
+    return [''.join(rand.choice(string.ascii_lowercase)
+                    for _ in range(rand.randint(min_length, max_length)))
+            for _ in range(count)]
+
+
+def long_keys(count, length, seed=0):
+    """Return a list of the given number of URL-like keys that each have the
+    given length and share a long common prefix, using the given seed."""
+    rand = random.Random(seed)
+    base = 'https://example.com/'
+    keys = []
+    for _ in range(count):
+        path = []
+        while len(base) + len(path) < length:
+            path.append(rand.choice(string.ascii_lowercase + '/'))
+        keys.append(base + ''.join(path))
+    return keys
+
+
+def best_time(function, *args, repeat=5) -> float:
+    """Return the best time in seconds of the given number of calls to the
+    given function with the given arguments."""
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def without_gc(function, *args):
+    """Return the result of calling the given function with the given
+    arguments while cyclic garbage collection is paused. Building a tree
+    creates many nodes that cannot form reference cycles, which otherwise
+    triggers repeated collections that rescan the growing tree for nothing.
+    This is left to callers since garbage collection is global to a process."""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return function(*args)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def recursive_strings(tree) -> [str]:
+    """Return a list of all strings in the given prefix tree using recursive
+    traversal that concatenates a new prefix string at every level, which is
+    how PrefixTree retrieved strings before its traversal became iterative."""
+    all_strings = []
+
+    def traverse(node, prefix):
+        if node.is_terminal():
+            all_strings.append(prefix)
+        for child in node.children.values():
+            traverse(child, prefix + child.character)
+
+    traverse(tree.root, '')
+    return all_strings
+
+
+def benchmark_traversal():
+    """Compare recursive and iterative traversal of prefix trees storing keys
+    of increasing length."""
+    print('Traversal of 200 keys: recursive vs. iterative strings()')
+    for length in [100, 500, 900, 2000, 10000]:
+        tree = PrefixTree(long_keys(200, length))
+        try:
+            recursive = '{:.6f} sec'.format(
+                best_time(recursive_strings, tree))
+        except RecursionError:
+            recursive = 'RecursionError'
+        iterative = best_time(tree.strings)
+        print(f'  key length {length:>5}: recursive {recursive:>14}'
+              f'  iterative {iterative:.6f} sec')
+
+
+def benchmark_build():
+    """Compare building a prefix tree by inserting each string with bulk
+    loading from sorted strings, for short random words that share little
+    of their prefixes and for long keys that share long prefixes."""
+    for words in [sorted(set(random_words(100000))),
+                  sorted(set(long_keys(5000, 100)))]:
+        print(f'Building a prefix tree of {len(words)} sorted words of '
+              f'average length {sum(map(len, words)) / len(words):.1f}')
+        insert_time = best_time(PrefixTree, words, repeat=3)
+        bulk_time = best_time(PrefixTree.from_sorted, words, repeat=3)
+        paused_time = best_time(without_gc, PrefixTree.from_sorted, words,
+                                repeat=3)
+        print(f'  insert each:  {insert_time:.6f} sec')
+        print(f'  from_sorted:  {bulk_time:.6f} sec'
+              f'  ({insert_time / bulk_time:.2f}x insert)')
+        print(f'  from_sorted with garbage collection paused: '
+              f'{paused_time:.6f} sec')
+
+
+def benchmark_batch_queries():
+    """Compare finding nodes for a batch of prefixes one at a time from the
+    root with finding them in sorted order with shared-prefix reuse."""
+    words = random_words(10000, 20, 40)
+    tree = PrefixTree(words)
+    # Every prefix of each word, like the prefixes typed in a search box
+    prefixes = [word[:end] for word in words for end in range(4, len(word))]
+    print(f'Finding {len(prefixes)} prefixes of {len(words)} long words')
+    single_time = best_time(
+        lambda: [tree._find_node(prefix) for prefix in prefixes], repeat=3)
+    batch_time = best_time(tree._find_many, prefixes, repeat=3)
+    print(f'  _find_node each: {single_time:.6f} sec')
+    print(f'  _find_many:      {batch_time:.6f} sec')
+
+
+def linear_fuzzy(words, prefix, max_edits) -> [str]:
+    """Return a list of the given words that start with a prefix within the
+    given maximum number of edits of the given prefix, by computing the edit
+    distance table against every word in turn."""
+    completions = []
+    for word in words:
+        row = list(range(len(prefix) + 1))
+        # Check the distance of every prefix of the word, including empty
+        best = row[-1]
+        for character in word:
+            next_row = [row[0] + 1]
+            for index in range(1, len(prefix) + 1):
+                cost = prefix[index - 1] != character
+                next_row.append(min(next_row[index - 1] + 1, row[index] + 1,
+                                    row[index - 1] + cost))
+            row = next_row
+            best = min(best, row[-1])
+        if best <= max_edits:
+            completions.append(word)
+    return completions
+
+
+def benchmark_fuzzy():
+    """Compare fuzzy completion over a prefix tree with computing the edit
+    distance against every word in a list."""
+    words = sorted(set(random_words(20000)))
+    tree = PrefixTree(words)
+    print(f'Fuzzy completion of 5-letter prefixes in {len(words)} words')
+    for max_edits in [1, 2]:
+        prefixes = [word[:5] for word in words[::2000]]
+        linear_time = best_time(
+            lambda: [linear_fuzzy(words, prefix, max_edits)
+                     for prefix in prefixes], repeat=1)
+        tree_time = best_time(
+            lambda: [tree.complete_fuzzy(prefix, max_edits)
+                     for prefix in prefixes], repeat=1)
+        print(f'  max_edits {max_edits}: linear {linear_time:.6f} sec'
+              f'  complete_fuzzy {tree_time:.6f} sec')
+
+
+def benchmark_children_types():
+    """Compare memory use, lookup and traversal cost of prefix trees with each
+    type of structure for storing children nodes."""
+    words = random_words(50000)
+    print(f'Children structures for a prefix tree of {len(words)} words')
+    for children_type in [dict, SortedChildren, AlphabetChildren,
+                          BitmapChildren]:
+        memory = setup_memory(PrefixTree, words, children_type)
+        tree = PrefixTree(words, children_type)
+        lookup_time = best_time(
+            lambda: [tree.contains(word) for word in words], repeat=3)
+        # Unordered structures must be sorted to retrieve strings in order
+        traversal_time = best_time(lambda: list(tree.iter_strings()), repeat=3)
+        print(f'  {children_type.__name__:>16}: memory {memory / 2**20:6.1f} '
+              f'MiB  contains {lookup_time:.6f} sec'
+              f'  sorted strings {traversal_time:.6f} sec')
+
+
+def setup_memory(structure_type, *args) -> int:
+    """Return the number of bytes allocated while creating a structure of the
+    given type with the given arguments."""
+    tracemalloc.start()
+    structure = structure_type(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return size
+
+
+def benchmark_ternary_search_tree():
+    """Compare setup time, memory use and completion time of a ternary search
+    tree and a prefix tree on the same word list."""
+    words = random_words(50000)
+    prefixes = sorted(set(word[:2] for word in words))
+    print(f'Ternary search tree vs. prefix tree of {len(words)} words')
+    for structure_type in [PrefixTree, TernarySearchTree]:
+        setup_time = best_time(structure_type, words, repeat=1)
+        memory = setup_memory(structure_type, words)
+        tree = structure_type(words)
+        complete_time = best_time(
+            lambda: [tree.complete(prefix) for prefix in prefixes], repeat=3)
+        print(f'  {structure_type.__name__:>17}: setup {setup_time:.6f} sec'
+              f'  memory {memory / 2**20:6.1f} MiB'
+              f'  complete {complete_time:.6f} sec')
+
+
+def benchmark_sorted_array():
+    """Compare setup time, memory use and completion time of a sorted array
+    and a prefix tree on the same word list, for short and long prefixes."""
+    words = random_words(50000)
+    print(f'Sorted array vs. prefix tree of {len(words)} words')
+    for structure_type in [PrefixTree, SortedArray]:
+        setup_time = best_time(structure_type, words, repeat=1)
+        memory = setup_memory(structure_type, words)
+        tree = structure_type(words)
+        print(f'  {structure_type.__name__:>11}: setup {setup_time:.6f} sec'
+              f'  memory {memory / 2**20:6.1f} MiB')
+        for length in [1, 3]:
+            prefixes = sorted(set(word[:length] for word in words))
+            complete_time = best_time(
+                lambda: [tree.complete(prefix) for prefix in prefixes],
+                repeat=3)
+            print(f'    complete {len(prefixes):>5} prefixes of length '
+                  f'{length}: {complete_time:.6f} sec')
+
+
+def benchmark_parallel_build():
+    """Compare building a compact prefix tree in this process with building
+    it in parallel with increasing numbers of worker processes."""
+    words = random_words(200000)
+    print(f'Building a compact prefix tree of {len(words)} words')
+    serial_time = best_time(CompactPrefixTree, words, repeat=1)
+    print(f'  serial:    {serial_time:.6f} sec')
+    for num_workers in [2, 4, 8]:
+        parallel_time = best_time(build_compact_prefix_tree, words,
+                                  num_workers, repeat=1)
+        print(f'  {num_workers} workers: {parallel_time:.6f} sec')
+
+
+def benchmark_bytes_prefix_tree():
+    """Compare setup time, memory use, lookup time and completion time of a
+    byte-level prefix tree and a prefix tree on the same word list, looking
+    up both strings and already encoded bytes."""
+    words = random_words(50000)
+    encoded = [word.encode('utf-8') for word in words]
+    prefixes = sorted(set(word[:2] for word in words))
+    print(f'Byte-level prefix tree vs. prefix tree of {len(words)} words')
+    for structure_type in [PrefixTree, BytesPrefixTree]:
+        setup_time = best_time(structure_type, words, repeat=1)
+        memory = setup_memory(structure_type, words)
+        tree = structure_type(words)
+        lookup_time = best_time(
+            lambda: [tree.contains(word) for word in words], repeat=3)
+        complete_time = best_time(
+            lambda: [tree.complete(prefix) for prefix in prefixes], repeat=3)
+        print(f'  {structure_type.__name__:>15}: setup {setup_time:.6f} sec'
+              f'  memory {memory / 2**20:6.1f} MiB'
+              f'  contains {lookup_time:.6f} sec'
+              f'  complete {complete_time:.6f} sec')
+    tree = BytesPrefixTree(words)
+    lookup_time = best_time(
+        lambda: [tree.contains(key) for key in encoded], repeat=3)
+    print(f'  {"bytes keys":>15}: contains {lookup_time:.6f} sec')
+
+
+def main():
+    """Run all prefix tree benchmarks and print their results."""
+    benchmark_traversal()
+    benchmark_build()
+    benchmark_batch_queries()
+    benchmark_fuzzy()
+    benchmark_children_types()
+    benchmark_ternary_search_tree()
+    benchmark_sorted_array()
+    benchmark_parallel_build()
+    benchmark_bytes_prefix_tree()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 #!python3
 
 from prefixtree import PrefixTree, PrefixTreeNode
+from prefixtreechildren import SortedChildren, AlphabetChildren, BitmapChildren
 import unittest
 
 
@@ -245,6 +246,273 @@ class PrefixTreeTest(unittest.TestCase):
             assert len(tree_strings) == len(input_strings)  # Check length only
             self.assertCountEqual(tree_strings, input_strings)  # Ignore order
 
+    def test_insert_with_weights(self):
+        tree = PrefixTree()
+        tree.insert('ABC', 5)
+        tree.insert('ABD', 3)
+        tree.insert('A')
+        # Verify weights and maximum subtree weights along the paths
+        node_A = tree.root.get_child('A')
+        node_B = node_A.get_child('B')
+        assert node_A.weight == 0
+        assert node_B.get_child('C').weight == 5
+        assert node_B.get_child('D').weight == 3
+        assert tree.root.max_weight == 5
+        assert node_A.max_weight == 5
+        assert node_B.max_weight == 5
+        # Verify repeated insert without a weight keeps the existing weight
+        tree.insert('ABC')
+        assert node_B.get_child('C').weight == 5
+        assert tree.size == 3
+        # Verify lowering a weight recomputes maximum subtree weights
+        tree.insert('ABC', 1)
+        assert node_B.get_child('C').weight == 1
+        assert node_B.max_weight == 3
+        assert tree.root.max_weight == 3
+        assert tree.size == 3
+
+    def test_complete_top_k(self):
+        tree = PrefixTree()
+        for string, weight in [('ABC', 5), ('ABD', 3), ('A', 1), ('AB', 3),
+                               ('XYZ', 9)]:
+            tree.insert(string, weight)
+        assert tree.complete_top_k('', 2) == ['XYZ', 'ABC']
+        assert tree.complete_top_k('A', 1) == ['ABC']
+        # Verify ties are broken in lexicographic order
+        assert tree.complete_top_k('A', 3) == ['ABC', 'AB', 'ABD']
+        assert tree.complete_top_k('A', 10) == ['ABC', 'AB', 'ABD', 'A']
+        assert tree.complete_top_k('AB', 0) == []
+        assert tree.complete_top_k('B', 3) == []
+
+    def test_iter_complete(self):
+        tree = PrefixTree(['XYZ', 'ABD', 'A', 'ABC', 'AA'])
+        completions = tree.iter_complete('A')
+        # Verify completions are generated lazily in lexicographic order
+        assert next(completions) == 'A'
+        assert next(completions) == 'AA'
+        assert list(completions) == ['ABC', 'ABD']
+        assert list(tree.iter_complete('XY')) == ['XYZ']
+        assert list(tree.iter_complete('B')) == []
+
+    def test_iter_strings(self):
+        strings = ['XYZ', 'ABD', 'A', 'ABC', 'AA']
+        tree = PrefixTree(strings)
+        assert list(tree.iter_strings()) == sorted(strings)
+        assert list(PrefixTree().iter_strings()) == []
+
+    def test_strings_with_very_long_keys(self):
+        # Keys longer than the recursion limit must not overflow the stack
+        long_key = 'A' * 5000
+        strings = [long_key, long_key + 'B', long_key[:2500] + 'C']
+        tree = PrefixTree(strings)
+        self.assertCountEqual(tree.strings(), strings)
+        self.assertCountEqual(tree.complete(long_key), strings[:2])
+        assert list(tree.iter_complete(long_key[:2500])) == sorted(strings)
+        assert repr(tree).startswith("PrefixTree(['AAA")
+
+    def test_from_sorted(self):
+        strings = ['A', 'ABC', 'ABC', 'ABD', 'XYZ']
+        tree = PrefixTree.from_sorted(iter(strings))
+        assert tree.size == 4
+        assert list(tree.iter_strings()) == ['A', 'ABC', 'ABD', 'XYZ']
+        # Verify the tree has the same structure as inserting one at a time
+        node_B = tree.root.get_child('A').get_child('B')
+        assert tree.root.num_children() == 2
+        assert node_B.is_terminal() is False
+        assert node_B.num_children() == 2
+        assert node_B.get_child('C').is_terminal() is True
+        assert tree.contains('ABD') is True
+        assert tree.contains('AB') is False
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        # Verify an empty iterable creates an empty tree
+        assert PrefixTree.from_sorted([]).is_empty() is True
+
+    def test_from_sorted_counts_and_weights(self):
+        strings = ['', 'A', 'ABC', 'ABC', 'ABCD', 'ABD', 'B', 'XYZ']
+        bulk = PrefixTree.from_sorted(strings)
+        inserted = PrefixTree(strings)
+        # Verify every node has the same count and maximum weight either way
+        stack = [(bulk.root, inserted.root)]
+        while stack:
+            bulk_node, inserted_node = stack.pop()
+            assert bulk_node.count == inserted_node.count
+            assert bulk_node.max_weight == inserted_node.max_weight
+            assert set(bulk_node.children) == set(inserted_node.children)
+            stack.extend((child, inserted_node.children[character])
+                         for character, child in bulk_node.children.items())
+        assert bulk.root.count == bulk.size == 7
+        assert bulk.rank('ABD') == inserted.rank('ABD') == 4
+
+    def test_from_sorted_with_unsorted_strings(self):
+        with self.assertRaises(ValueError):
+            PrefixTree.from_sorted(['ABC', 'ABD', 'AB'])
+
+    def test_contains_many(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        words = ['XYZ', 'AB', 'ABD', 'B', 'A', 'ABC', 'ABCD', 'XY', 'ABD']
+        results = tree.contains_many(words)
+        # Verify results are in the same order as the given strings
+        assert results == [tree.contains(word) for word in words]
+        assert results == [True, False, True, False, True, True, False,
+                           False, True]
+        assert tree.contains_many([]) == []
+
+    def test_complete_many(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        prefixes = ['X', 'AB', 'A', 'BC', 'ABC', 'XYZW', '', 'AB']
+        results = tree.complete_many(iter(prefixes))
+        assert results == [tree.complete(prefix) for prefix in prefixes]
+        assert results[1] == ['ABC', 'ABD']
+        assert results[3] == []
+
+    def test_complete_fuzzy(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ', 'BCD', 'AXC']
+        tree = PrefixTree(strings)
+        # Verify exact matching with no edits is the same as complete
+        for prefix in ['AB', 'A', 'X', 'B', 'Q']:
+            self.assertCountEqual(tree.complete_fuzzy(prefix, 0),
+                                  tree.complete(prefix))
+        # Substitution and deletion: 'AX' is one edit from 'A', 'AB' and 'X'
+        # but two edits from 'B' and 'BC'
+        self.assertCountEqual(tree.complete_fuzzy('AX', 1),
+                              ['A', 'ABC', 'ABD', 'AXC', 'XYZ'])
+        # Deletion: 'ABXC' is one edit from 'ABC' and 'AXC'
+        self.assertCountEqual(tree.complete_fuzzy('ABXC', 1),
+                              ['ABC', 'AXC'])
+        # Insertion: 'XZ' is one edit from 'XYZ'
+        assert tree.complete_fuzzy('XZ', 1) == ['XYZ']
+        # Any prefix no longer than max_edits matches every string
+        self.assertCountEqual(tree.complete_fuzzy('Q', 1), strings)
+        assert tree.complete_fuzzy('QQQ', 1) == []
+
+    def test_delete(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        # Delete a leaf string that shares a prefix with another string
+        tree.delete('ABC')
+        assert tree.size == 3
+        assert tree.contains('ABC') is False
+        node_B = tree.root.get_child('A').get_child('B')
+        assert node_B.has_child('C') is False
+        assert node_B.has_child('D') is True
+        # Delete a string that is a prefix of another string
+        tree.delete('A')
+        assert tree.size == 2
+        assert tree.contains('A') is False
+        assert tree.root.get_child('A').is_terminal() is False
+        assert tree.complete('A') == ['ABD']
+        # Delete a string so its whole chain of nodes is pruned
+        tree.delete('ABD')
+        assert tree.root.has_child('A') is False
+        assert tree.strings() == ['XYZ']
+        tree.delete('XYZ')
+        assert tree.is_empty() is True
+        assert tree.root.num_children() == 0
+
+    def test_delete_missing_string(self):
+        tree = PrefixTree(['ABC', 'A'])
+        with self.assertRaises(ValueError):
+            tree.delete('AB')
+        with self.assertRaises(ValueError):
+            tree.delete('ABCD')
+        with self.assertRaises(ValueError):
+            tree.delete('X')
+        assert tree.size == 2
+
+    def test_delete_updates_max_weights(self):
+        tree = PrefixTree()
+        tree.insert('ABC', 5)
+        tree.insert('ABD', 3)
+        tree.delete('ABC')
+        assert tree.root.max_weight == 3
+        assert tree.complete_top_k('A', 1) == ['ABD']
+
+    def test_version(self):
+        tree = PrefixTree(['ABC', 'ABD'])
+        version = tree.version
+        # Verify version is unchanged by queries and a repeated insert
+        tree.complete('A')
+        tree.insert('ABC')
+        assert tree.version == version
+        tree.insert('A')
+        assert tree.version > version
+        version = tree.version
+        tree.insert('A', 5)
+        assert tree.version > version
+        version = tree.version
+        tree.delete('ABC')
+        assert tree.version > version
+        assert PrefixTree.from_sorted(['A', 'B']).version > 0
+
+    def test_compact(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        # Leave a dead-end chain of nodes that do not lead to any string
+        tree.root.get_child('X').get_child('Y').get_child('Z').terminal = False
+        tree.size -= 1
+        tree.compact()
+        assert tree.root.has_child('X') is False
+        assert tree.root.num_children() == 1
+        assert tree.strings() == ['A', 'ABC', 'ABD']
+
+    def test_counts(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.root.count == 4
+        node_A = tree.root.get_child('A')
+        assert node_A.count == 3
+        assert node_A.get_child('B').count == 2
+        # Verify counts are unchanged by a repeated insert
+        tree.insert('ABD')
+        assert node_A.count == 3
+        # Verify counts are updated by delete
+        tree.delete('ABC')
+        assert tree.root.count == 3
+        assert node_A.count == 2
+        assert node_A.get_child('B').count == 1
+
+    def test_count_prefix(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        for prefix in ['', 'A', 'AB', 'ABC', 'X', 'XY', 'B', 'ABCD']:
+            assert tree.count_prefix(prefix) == len(tree.complete(prefix))
+        # Verify counts from a tree built by bulk loading
+        tree = PrefixTree.from_sorted(['A', 'ABC', 'ABD', 'XYZ'])
+        assert tree.count_prefix('') == 4
+        assert tree.count_prefix('AB') == 2
+
+    def test_rank_and_select(self):
+        strings = ['XYZ', 'ABD', 'A', 'ABC', 'AA', 'B']
+        tree = PrefixTree(strings)
+        sorted_strings = sorted(strings)
+        for index, string in enumerate(sorted_strings):
+            assert tree.rank(string) == index
+            assert tree.select(index) == string
+        # Verify ranks of strings that are not stored in the tree
+        assert tree.rank('') == 0
+        assert tree.rank('AB') == 2
+        assert tree.rank('ABCD') == 3
+        assert tree.rank('C') == 5
+        assert tree.rank('ZZ') == 6
+        with self.assertRaises(IndexError):
+            tree.select(6)
+        with self.assertRaises(IndexError):
+            tree.select(-1)
+
+    def test_ordered_children_types(self):
+        strings = ['xyz', 'abd', 'a', 'abc', 'aa', 'b']
+        for children_type in [SortedChildren, AlphabetChildren,
+                              BitmapChildren]:
+            tree = PrefixTree(strings, children_type)
+            assert isinstance(tree.root.children, children_type)
+            # Verify strings and completions are in sorted order natively
+            assert tree.strings() == sorted(strings)
+            assert tree.complete('a') == ['a', 'aa', 'abc', 'abd']
+            assert tree.select(2) == 'abc'
+            assert tree.rank('abd') == 3
+            tree.delete('abc')
+            tree.compact()
+            assert isinstance(tree.root.children, children_type)
+            assert tree.strings() == ['a', 'aa', 'abd', 'b', 'xyz']
+            tree = PrefixTree.from_sorted(sorted(strings), children_type)
+            assert tree.strings() == sorted(strings)
+
 
 if __name__ == '__main__':
     unittest.main()
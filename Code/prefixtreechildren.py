@@ -0,0 +1,259 @@
+#!python3
+
+from bitmaparray import BITS, MASKS, BitmapArray
+from bisect import bisect_left
+from collections.abc import MutableMapping
+
+# Lowercase ASCII letters that AlphabetChildren and BitmapChildren can store
+# and the code point of the first one
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+BASE = ord('a')
+
+
+def _letter_index(character) -> int:
+    """Return the index of the given character in the alphabet, or -1 if it
+    is not a lowercase ASCII letter."""
+    if len(character) != 1:
+        return -1
+    index = ord(character) - BASE
+    if 0 <= index < 26:
+        return index
+    return -1
+
+
+class SortedChildren(MutableMapping):
+    """SortedChildren: A structure of children nodes for a prefix tree node
+    that keeps its characters in a sorted array, with the children nodes in a
+    parallel array. Finds a character with binary search in O(log k) time for
+    k children and iterates over characters in sorted order, so a prefix tree
+    with this structure retrieves its strings in lexicographic order."""
+
+    # Marks that iterating over this structure yields characters in order
+    ORDERED = True
+
+    __slots__ = ('characters', 'nodes')
+
+    def __init__(self, items=None):
+        """Initialize this structure with the given (character, node) pairs or
+        mapping of characters to nodes, if any."""
+        self.characters = []
+        self.nodes = []
+        if items is not None:
+            self.update(items)
+
+    def _index(self, character) -> int:
+        """Return the index of the given character in the sorted array of
+        characters, or -1 if it is not amongst this structure's characters."""
+        characters = self.characters
+        index = bisect_left(characters, character)
+        if index < len(characters) and characters[index] == character:
+            return index
+        return -1
+
+    def __len__(self) -> int:
+        return len(self.characters)
+
+    def __iter__(self):
+        return iter(self.characters)
+
+    def __contains__(self, character) -> bool:
+        return self._index(character) >= 0
+
+    def __getitem__(self, character):
+        index = self._index(character)
+        if index < 0:
+            raise KeyError(character)
+        return self.nodes[index]
+
+    def get(self, character, default=None):
+        index = self._index(character)
+        if index < 0:
+            return default
+        return self.nodes[index]
+
+    def __setitem__(self, character, node):
+        characters = self.characters
+        index = bisect_left(characters, character)
+        if index < len(characters) and characters[index] == character:
+            self.nodes[index] = node
+        else:
+            characters.insert(index, character)
+            self.nodes.insert(index, node)
+
+    def __delitem__(self, character):
+        index = self._index(character)
+        if index < 0:
+            raise KeyError(character)
+        del self.characters[index]
+        del self.nodes[index]
+
+    def values(self):
+        return iter(self.nodes)
+
+    def items(self):
+        return zip(self.characters, self.nodes)
+
+    def __repr__(self):
+        """Return a code representation of this structure."""
+        return f'SortedChildren({list(self.items())!r})'
+
+
+class AlphabetChildren(MutableMapping):
+    """AlphabetChildren: A structure of children nodes for a prefix tree node
+    that stores strings of lowercase ASCII letters, with one slot in a fixed
+    array for each of the 26 letters. Finds a letter's child node by indexing
+    the array in O(1) time without hashing and iterates over letters in
+    alphabetical order. The array is only allocated for the first child."""
+
+    # Marks that iterating over this structure yields characters in order
+    ORDERED = True
+
+    # Letters this structure can store and the code point of the first one
+    ALPHABET = ALPHABET
+    BASE = BASE
+
+    __slots__ = ('slots', 'length')
+
+    def __init__(self, items=None):
+        """Initialize this structure with the given (character, node) pairs or
+        mapping of characters to nodes, if any."""
+        self.slots = None
+        self.length = 0
+        if items is not None:
+            self.update(items)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self):
+        if self.slots is None:
+            return iter(())
+        return (AlphabetChildren.ALPHABET[index]
+                for index, node in enumerate(self.slots) if node is not None)
+
+    def __contains__(self, character) -> bool:
+        return self.get(character) is not None
+
+    def __getitem__(self, character):
+        node = self.get(character)
+        if node is None:
+            raise KeyError(character)
+        return node
+
+    def get(self, character, default=None):
+        # Inlined slot lookup since this is called once per character searched
+        slots = self.slots
+        if slots is not None and len(character) == 1:
+            index = ord(character) - AlphabetChildren.BASE
+            if 0 <= index < 26 and slots[index] is not None:
+                return slots[index]
+        return default
+
+    def __setitem__(self, character, node):
+        index = _letter_index(character)
+        if index < 0:
+            raise ValueError(f'Character not in alphabet: {character!r}')
+        if self.slots is None:
+            self.slots = [None] * 26
+        if self.slots[index] is None:
+            self.length += 1
+        self.slots[index] = node
+
+    def __delitem__(self, character):
+        index = _letter_index(character)
+        if index < 0 or self.slots is None or self.slots[index] is None:
+            raise KeyError(character)
+        self.slots[index] = None
+        self.length -= 1
+
+    def values(self):
+        if self.slots is None:
+            return iter(())
+        return iter([node for node in self.slots if node is not None])
+
+    def items(self):
+        if self.slots is None:
+            return iter(())
+        return ((AlphabetChildren.ALPHABET[index], node)
+                for index, node in enumerate(self.slots) if node is not None)
+
+    def __repr__(self):
+        """Return a code representation of this structure."""
+        return f'AlphabetChildren({list(self.items())!r})'
+
+
+class BitmapChildren(BitmapArray, MutableMapping):
+    """BitmapChildren: A structure of children nodes for a prefix tree node
+    that stores strings of lowercase ASCII letters in a BitmapArray indexed by
+    each letter's position in the alphabet, with one bit set in its bitmap for
+    each letter that has a child node and the children nodes in a dense array
+    in alphabetical order. Finds a letter's child node in O(1) time with a bit
+    test, a population count and an array index. Unlike AlphabetChildren, the
+    array only has room for the children that exist, so nodes with few
+    children use much less memory than with a full array or a dictionary."""
+
+    # Marks that iterating over this structure yields characters in order
+    ORDERED = True
+
+    # Letters this structure can store and the code point of the first one
+    ALPHABET = ALPHABET
+    BASE = BASE
+
+    __slots__ = ()
+
+    def __init__(self, items=None):
+        """Initialize this structure with the given (character, node) pairs or
+        mapping of characters to nodes, if any."""
+        super().__init__()
+        if items is not None:
+            self.update(items)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return (ALPHABET[index] for index in self.indexes())
+
+    def __contains__(self, character) -> bool:
+        return self.get(character) is not None
+
+    def __getitem__(self, character):
+        node = self.get(character)
+        if node is None:
+            raise KeyError(character)
+        return node
+
+    def get(self, character, default=None):
+        # Inlined entry lookup since this is called once per character searched
+        try:
+            index = ord(character) - BASE
+        except TypeError:
+            # case: not a single character
+            return default
+        if 0 <= index < 26:
+            bitmap = self.bitmap
+            if bitmap & BITS[index]:
+                return self.entries[(bitmap & MASKS[index]).bit_count()]
+        return default
+
+    def __setitem__(self, character, node):
+        index = _letter_index(character)
+        if index < 0:
+            raise ValueError(f'Character not in alphabet: {character!r}')
+        self.set_entry(index, node)
+
+    def __delitem__(self, character):
+        index = _letter_index(character)
+        if index < 0 or not self.has_entry(index):
+            raise KeyError(character)
+        self.delete_entry(index)
+
+    def values(self):
+        return iter(self.entries)
+
+    def items(self):
+        return zip(self, self.entries)
+
+    def __repr__(self):
+        """Return a code representation of this structure."""
+        return f'BitmapChildren({list(self.items())!r})'
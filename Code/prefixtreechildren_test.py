@@ -0,0 +1,118 @@
+#!python3
+
+from prefixtreechildren import SortedChildren, AlphabetChildren, BitmapChildren
+from prefixtreenode import PrefixTreeNode
+import unittest
+
+
+class ChildrenTestMixin:
+
+    CHILDREN_TYPE = None
+
+    def test_init_and_properties(self):
+        children = self.CHILDREN_TYPE()
+        assert len(children) == 0
+        assert list(children) == []
+        assert children == self.CHILDREN_TYPE()
+        assert children == {}
+        assert 'a' not in children
+        assert children.get('a') is None
+        with self.assertRaises(KeyError):
+            children['a']
+
+    def test_set_get_and_delete(self):
+        children = self.CHILDREN_TYPE()
+        node_c = PrefixTreeNode('c')
+        node_a = PrefixTreeNode('a')
+        node_b = PrefixTreeNode('b')
+        children['c'] = node_c
+        children['a'] = node_a
+        children['b'] = node_b
+        # Verify characters and nodes are iterated in sorted order
+        assert len(children) == 3
+        assert list(children) == ['a', 'b', 'c']
+        assert list(children.values()) == [node_a, node_b, node_c]
+        assert list(children.items()) == [('a', node_a), ('b', node_b),
+                                          ('c', node_c)]
+        assert 'b' in children
+        assert children['b'] is node_b
+        assert children.get('b') is node_b
+        assert children == {'a': node_a, 'b': node_b, 'c': node_c}
+        # Verify deleting a child removes only that child
+        del children['b']
+        assert len(children) == 2
+        assert 'b' not in children
+        assert list(children) == ['a', 'c']
+        with self.assertRaises(KeyError):
+            del children['b']
+
+    def test_node_with_children_type(self):
+        node = PrefixTreeNode('A', self.CHILDREN_TYPE)
+        assert isinstance(node.children, self.CHILDREN_TYPE)
+        node.add_child('z', PrefixTreeNode('z'))
+        node.add_child('m', PrefixTreeNode('m'))
+        assert node.num_children() == 2
+        assert node.has_child('m') is True
+        assert node.get_child('z').character == 'z'
+        with self.assertRaises(ValueError):
+            node.add_child('m', PrefixTreeNode('m'))
+
+
+class SortedChildrenTest(ChildrenTestMixin, unittest.TestCase):
+
+    CHILDREN_TYPE = SortedChildren
+
+    def test_any_characters(self):
+        children = SortedChildren([('é', 1), ('Z', 2), ('a', 3)])
+        assert list(children) == ['Z', 'a', 'é']
+        assert children['é'] == 1
+
+
+class AlphabetChildrenTest(ChildrenTestMixin, unittest.TestCase):
+
+    CHILDREN_TYPE = AlphabetChildren
+
+    def test_characters_outside_alphabet(self):
+        children = AlphabetChildren()
+        assert 'A' not in children
+        assert children.get('é') is None
+        with self.assertRaises(ValueError):
+            children['A'] = PrefixTreeNode('A')
+        assert len(children) == 0
+
+
+class BitmapChildrenTest(ChildrenTestMixin, unittest.TestCase):
+
+    CHILDREN_TYPE = BitmapChildren
+
+    def test_characters_outside_alphabet(self):
+        children = BitmapChildren()
+        assert 'A' not in children
+        assert children.get('é') is None
+        assert children.get('ab') is None
+        with self.assertRaises(ValueError):
+            children['A'] = PrefixTreeNode('A')
+        assert len(children) == 0
+
+    def test_bitmap_and_dense_entries(self):
+        children = BitmapChildren()
+        nodes = {letter: PrefixTreeNode(letter) for letter in 'zamb'}
+        for letter, node in nodes.items():
+            children[letter] = node
+        # One bit per letter and only as many nodes as children
+        assert children.bitmap == sum(1 << (ord(letter) - ord('a'))
+                                      for letter in 'abmz')
+        assert children.entries == [nodes[letter] for letter in 'abmz']
+        # Replacing a child keeps the bitmap and number of nodes
+        node = PrefixTreeNode('m')
+        children['m'] = node
+        assert children['m'] is node
+        assert len(children.entries) == 4
+        for letter in 'abmz':
+            del children[letter]
+        assert children.bitmap == 0
+        assert list(children.items()) == []
+
+
+if __name__ == '__main__':
+    unittest.main()
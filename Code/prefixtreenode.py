@@ -9,15 +9,30 @@ class PrefixTreeNode:
 
     CHILDREN_TYPE = dict
 
-    def __init__(self, character=None):
+    # Store attributes in fixed slots instead of a per-instance __dict__ to
+    # save memory, since a prefix tree allocates one node for every character
+    __slots__ = ('character', 'children', 'terminal', 'weight', 'max_weight',
+                 'count')
+
+    def __init__(self, character=None, children_type=None):
         """Initialize this prefix tree node with the given character value, an
-        empty structure of children nodes, and a boolean terminal property."""
+        empty structure of children nodes of the given type (CHILDREN_TYPE by
+        default), and a boolean terminal property."""
         # Character that this node represents
         self.character = character
         # Data structure to associate character keys to children node values
-        self.children = PrefixTreeNode.CHILDREN_TYPE()
+        if children_type is None:
+            children_type = PrefixTreeNode.CHILDREN_TYPE
+        self.children = children_type()
         # Marks if this node terminates a string in the prefix tree
         self.terminal = False
+        # Weight of the string this node terminates, used to rank completions
+        self.weight = 0
+        # Maximum weight of any string that terminates in this node's subtree
+        self.max_weight = float('-inf')
+        # Number of strings that terminate in this node's subtree, including
+        # the string this node terminates, if any
+        self.count = 0
 
     def is_terminal(self) -> bool:
         """Return True if this prefix tree node terminates a string."""
@@ -0,0 +1,184 @@
+#!python3
+
+
+class RadixTreeNode:
+    """RadixTreeNode: A node for use in a radix tree that stores a substring
+    label along the edge from its parent node and a structure of children
+    nodes below it, which associates the first character of each child's label
+    to the child node, and a boolean terminal property."""
+
+    CHILDREN_TYPE = dict
+
+    __slots__ = ('label', 'children', 'terminal')
+
+    def __init__(self, label=''):
+        """Initialize this radix tree node with the given label, an empty
+        structure of children nodes, and a boolean terminal property."""
+        # Substring along the edge from this node's parent to this node
+        self.label = label
+        # Data structure to associate first label characters to children nodes
+        self.children = RadixTreeNode.CHILDREN_TYPE()
+        # Marks if this node terminates a string in the radix tree
+        self.terminal = False
+
+    def is_terminal(self) -> bool:
+        """Return True if this radix tree node terminates a string."""
+        return self.terminal
+
+    def num_children(self) -> int:
+        """Return the number of children nodes this radix tree node has."""
+        return len(self.children)
+
+    def __repr__(self):
+        """Return a code representation of this radix tree node."""
+        return f'RadixTreeNode({self.label!r})'
+
+
+class RadixTree:
+    """RadixTree: A path-compressed prefix tree with the same methods as
+    PrefixTree. Each chain of nodes with a single child and no terminal marker
+    is merged into one node whose label stores the whole substring, so the
+    number of nodes is at most twice the number of strings stored, instead of
+    one node per character. Inserting a string that diverges partway along a
+    node's label splits that node in two at the point of divergence."""
+
+    def __init__(self, strings=None):
+        """Initialize this radix tree and insert the given strings, if any."""
+        # Create a new root node with an empty label
+        self.root = RadixTreeNode()
+        # Count the number of complete words inserted into the tree
+        self.size = 0
+        # Insert each string, if any were given
+        if strings is not None:
+            for string in strings:
+                self.insert(string)
+
+    def __repr__(self):
+        """Return a string representation of this radix tree."""
+        return f'RadixTree({self.strings()!r})'
+
+    def is_empty(self) -> bool:
+        """Return True if this radix tree is empty (contains no strings)."""
+        return self.size == 0
+
+    def num_nodes(self) -> int:
+        """Return the number of nodes in this radix tree, including its root."""
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
+
+    def contains(self, word: str) -> bool:
+        """Return True if this radix tree contains the given string."""
+        node, _ = self._find_node(word)
+        return node is not None and node.terminal
+
+    def insert(self, word: str):
+        """Insert the given string into this radix tree."""
+        node = self.root
+        index = 0
+        while index < len(word):
+            child = node.children.get(word[index])
+            # case: no child label starts with the next letter so add the rest
+            # of the word as a single new leaf node
+            if child is None:
+                child = RadixTreeNode(word[index:])
+                node.children[word[index]] = child
+                node = child
+                break
+            label = child.label
+            common = _common_prefix_length(label, word, index)
+            # case: word diverges partway along the child's label so split the
+            # child into a parent with the shared part and a child with the rest
+            if common < len(label):
+                middle = RadixTreeNode(label[:common])
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                node.children[word[index]] = middle
+                child = middle
+            # traverse down
+            node = child
+            index += common
+        # case: node already exists & is a terminal
+        if node.terminal:
+            return
+        node.terminal = True
+        self.size += 1
+
+    def _find_node(self, word: str) -> (RadixTreeNode, int):
+        """Return a tuple containing the node that terminates the given string
+        in this radix tree and the node's depth, or if the given string does
+        not end exactly at a node, return None and the number of characters
+        matched along the path. Search is done iteratively from the root."""
+        node = self.root
+        index = 0
+        while index < len(word):
+            child = node.children.get(word[index])
+            if child is None or not word.startswith(child.label, index):
+                return None, index
+            node = child
+            index += len(child.label)
+        return node, index
+
+    def _find_prefix(self, prefix: str) -> (RadixTreeNode, str):
+        """Return a tuple containing the highest node whose path from the root
+        starts with the given prefix and the string along that path, or None
+        and the empty string if no stored string starts with the prefix."""
+        node = self.root
+        path = ''
+        while len(path) < len(prefix):
+            child = node.children.get(prefix[len(path)])
+            if child is None:
+                return None, ''
+            label = child.label
+            remaining = prefix[len(path):]
+            # The prefix may end partway along the child's label
+            if not (label.startswith(remaining) or
+                    remaining.startswith(label)):
+                return None, ''
+            node = child
+            path += label
+        return node, path
+
+    def complete(self, word_or_prefix: str) -> [str]:
+        """Return a list of all strings stored in this radix tree that start
+        with the given prefix string."""
+        completions = []
+        node, path = self._find_prefix(word_or_prefix)
+        # case: prefix does not exist
+        if node is None:
+            return completions
+        self._traverse(node, path, completions.append)
+        return completions
+
+    def strings(self) -> [str]:
+        """Return a list of all strings stored in this radix tree."""
+        all_strings = []
+        self._traverse(self.root, '', all_strings.append)
+        return all_strings
+
+    def _traverse(self, node: RadixTreeNode, prefix: str, visit):
+        """Traverse the subtree below the given node with an iterative
+        depth-first traversal and visit each string that terminates in it with
+        the given function, in the same order as a recursive pre-order."""
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            if node.terminal:
+                visit(prefix)
+            # Push children in reverse so they are popped in insertion order
+            for child in reversed(node.children.values()):
+                stack.append((child, prefix + child.label))
+
+
+def _common_prefix_length(label: str, word: str, start: int) -> int:
+    """Return the length of the longest common prefix of the given label and
+    the given word starting at the given index."""
+    limit = min(len(label), len(word) - start)
+    length = 0
+    while length < limit and label[length] == word[start + length]:
+        length += 1
+    return length
@@ -0,0 +1,89 @@
+#!python3
+
+from radixtree import RadixTree, RadixTreeNode
+from prefixtree import PrefixTree
+import unittest
+
+
+class RadixTreeTest(unittest.TestCase):
+
+    def test_init_and_properties(self):
+        tree = RadixTree()
+        assert tree.size == 0
+        assert tree.is_empty() is True
+        assert isinstance(tree.root, RadixTreeNode)
+        assert tree.root.label == ''
+        assert tree.root.is_terminal() is False
+        assert tree.root.num_children() == 0
+
+    def test_insert_compresses_single_child_chains(self):
+        tree = RadixTree()
+        tree.insert('ABC')
+        # Verify the whole string is stored as one edge label
+        assert tree.root.num_children() == 1
+        node_ABC = tree.root.children['A']
+        assert node_ABC.label == 'ABC'
+        assert node_ABC.is_terminal() is True
+        assert node_ABC.num_children() == 0
+
+    def test_insert_splits_node_on_divergence(self):
+        tree = RadixTree(['ABC'])
+        # Insert string with partial overlap so node 'ABC' splits after 'AB'
+        tree.insert('ABD')
+        node_AB = tree.root.children['A']
+        assert node_AB.label == 'AB'
+        assert node_AB.is_terminal() is False
+        assert node_AB.num_children() == 2
+        assert node_AB.children['C'].label == 'C'
+        assert node_AB.children['D'].label == 'D'
+        # Insert substring that ends partway along label 'AB' so it splits
+        tree.insert('A')
+        node_A = tree.root.children['A']
+        assert node_A.label == 'A'
+        assert node_A.is_terminal() is True
+        assert node_A.num_children() == 1
+        assert node_A.children['B'] is node_AB
+        assert node_AB.label == 'B'
+        assert tree.size == 3
+        assert tree.num_nodes() == 5
+
+    def test_size_with_repeated_insert(self):
+        tree = RadixTree()
+        for string in ['A', 'A', 'ABC', 'ABC', 'ABD', 'XYZ', 'XYZ']:
+            tree.insert(string)
+        assert tree.size == 4
+
+    def test_contains(self):
+        tree = RadixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.contains('ABC') is True
+        assert tree.contains('ABD') is True
+        assert tree.contains('A') is True
+        assert tree.contains('XYZ') is True
+        assert tree.contains('AB') is False
+        assert tree.contains('XY') is False
+        assert tree.contains('XYZW') is False
+        assert tree.contains('B') is False
+
+    def test_complete(self):
+        tree = RadixTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.complete('ABC') == ['ABC']
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        assert tree.complete('A') == ['A', 'ABC', 'ABD']
+        assert tree.complete('XY') == ['XYZ']
+        assert tree.complete('X') == ['XYZ']
+        assert tree.complete('XZ') == []
+        assert tree.complete('XYZW') == []
+        assert tree.complete('B') == []
+
+    def test_matches_prefix_tree(self):
+        strings = 'Shelly sells seashells by the sea shore'.split()
+        radix_tree = RadixTree(strings)
+        tree = PrefixTree(strings)
+        self.assertCountEqual(radix_tree.strings(), tree.strings())
+        for prefix in ['', 'S', 's', 'se', 'sea', 'seas', 'sh', 'b', 'x']:
+            self.assertCountEqual(radix_tree.complete(prefix),
+                                  tree.complete(prefix))
+
+
+if __name__ == '__main__':
+    unittest.main()
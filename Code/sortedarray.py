@@ -0,0 +1,141 @@
+#!python3
+
+from bisect import bisect_left
+from collections.abc import Sequence
+
+# Largest Unicode code point, which no character in a string can exceed
+MAX_CHARACTER = chr(0x10FFFF)
+
+
+class SortedArray:
+    """SortedArray: A read-mostly structure with the same methods as
+    PrefixTree that stores strings in a sorted Python list. All strings that
+    start with a given prefix are adjacent in sorted order, so binary search
+    finds the range of completions in O(log n) time, and completions are
+    returned as a view of that range of the list instead of a copy. Uses far
+    less memory than a prefix tree since it stores no node objects at all,
+    but inserting a new string takes O(n) time to shift the list. Inserting
+    invalidates views returned before it, which raise RuntimeError if used."""
+
+    def __init__(self, strings=None):
+        """Initialize this array with the given strings, if any."""
+        # Sort the unique strings once instead of inserting one at a time
+        self.items = sorted(set(strings)) if strings is not None else []
+        # Incremented whenever the strings stored change, so that views of
+        # ranges of the list can tell when their indexes are out of date
+        self.version = 0
+
+    @property
+    def size(self) -> int:
+        """Return the number of strings stored in this array."""
+        return len(self.items)
+
+    def __repr__(self):
+        """Return a string representation of this array."""
+        return f'SortedArray({self.items!r})'
+
+    def is_empty(self) -> bool:
+        """Return True if this array is empty (contains no strings)."""
+        return len(self.items) == 0
+
+    def contains(self, word: str) -> bool:
+        """Return True if this array contains the given string."""
+        index = bisect_left(self.items, word)
+        return index < len(self.items) and self.items[index] == word
+
+    def insert(self, word: str):
+        """Insert the given string into this array in sorted position."""
+        index = bisect_left(self.items, word)
+        if index == len(self.items) or self.items[index] != word:
+            self.items.insert(index, word)
+            self.version += 1
+
+    def complete(self, word_or_prefix: str) -> Sequence:
+        """Return a view of all strings stored in this array that start with
+        the given prefix string, in sorted order, without copying them. The
+        view is only valid until the next string is inserted."""
+        start = bisect_left(self.items, word_or_prefix)
+        successor = _successor(word_or_prefix)
+        if successor is None:
+            end = len(self.items)
+        else:
+            end = bisect_left(self.items, successor, start)
+        return SortedArrayView(self, start, end)
+
+    def strings(self) -> [str]:
+        """Return a list of all strings stored in this array."""
+        return list(self.items)
+
+
+class SortedArrayView(Sequence):
+    """SortedArrayView: A read-only view of a range of strings in a sorted
+    array that supports len, indexing, slicing and iteration like a list,
+    without copying the strings into a new list. Inserting into the array
+    shifts the strings in its list, so a view raises RuntimeError if it is
+    used after the array has changed instead of returning wrong strings."""
+
+    __slots__ = ('array', 'items', 'start', 'end', 'version')
+
+    def __init__(self, array, start, end):
+        """Initialize this view of the given sorted array's list from the
+        given start index up to but not including the given end index."""
+        self.array = array
+        self.items = array.items
+        self.start = start
+        self.end = end
+        # Version of the array that the start and end indexes are valid for
+        self.version = array.version
+
+    def _check_valid(self):
+        """Raise RuntimeError if the array changed after this view was made."""
+        if self.array.version != self.version:
+            raise RuntimeError('Sorted array changed after view was created')
+
+    def __len__(self) -> int:
+        self._check_valid()
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        self._check_valid()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return SortedArrayView(self.array, self.start + start,
+                                       self.start + max(start, stop))
+            return [self.items[self.start + i]
+                    for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('View index out of range')
+        return self.items[self.start + index]
+
+    def __iter__(self):
+        self._check_valid()
+        items = self.items
+        for index in range(self.start, self.end):
+            # case: array changed while iterating over this view
+            if self.array.version != self.version:
+                self._check_valid()
+            yield items[index]
+
+    def __eq__(self, other):
+        # Compare only with list-like sequences, not strings or bytes
+        if isinstance(other, (list, tuple, SortedArrayView)):
+            return len(self) == len(other) and all(
+                item == other_item for item, other_item in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        """Return a string representation of this view."""
+        return f'SortedArrayView({list(self)!r})'
+
+
+def _successor(prefix: str) -> str:
+    """Return the smallest string greater than every string that starts with
+    the given prefix, or None if there is no such string (the prefix is empty
+    or made only of the largest possible character)."""
+    prefix = prefix.rstrip(MAX_CHARACTER)
+    if len(prefix) == 0:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
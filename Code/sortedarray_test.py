@@ -0,0 +1,99 @@
+#!python3
+
+from sortedarray import SortedArray, SortedArrayView, MAX_CHARACTER
+import unittest
+
+
+class SortedArrayTest(unittest.TestCase):
+
+    def test_init_and_properties(self):
+        array = SortedArray()
+        assert array.size == 0
+        assert array.is_empty() is True
+        assert array.strings() == []
+        array = SortedArray(['XYZ', 'ABC', 'A', 'ABC'])
+        assert array.size == 3
+        assert array.strings() == ['A', 'ABC', 'XYZ']
+
+    def test_insert_and_contains(self):
+        array = SortedArray(['ABC', 'XYZ'])
+        array.insert('ABD')
+        array.insert('A')
+        array.insert('ABD')
+        assert array.size == 4
+        assert array.strings() == ['A', 'ABC', 'ABD', 'XYZ']
+        assert array.contains('ABD') is True
+        assert array.contains('A') is True
+        assert array.contains('AB') is False
+        assert array.contains('ZZZ') is False
+        assert array.contains('') is False
+
+    def test_complete(self):
+        array = SortedArray(['ABC', 'ABD', 'A', 'XYZ', 'B'])
+        assert array.complete('ABC') == ['ABC']
+        assert array.complete('AB') == ['ABC', 'ABD']
+        assert array.complete('A') == ['A', 'ABC', 'ABD']
+        assert array.complete('') == ['A', 'ABC', 'ABD', 'B', 'XYZ']
+        assert array.complete('XY') == ['XYZ']
+        assert array.complete('C') == []
+        assert array.complete('ABCD') == []
+
+    def test_complete_with_largest_character(self):
+        strings = ['A' + MAX_CHARACTER, 'A' + MAX_CHARACTER + 'B', 'B']
+        array = SortedArray(strings)
+        assert array.complete('A') == strings[:2]
+        assert array.complete('A' + MAX_CHARACTER) == strings[:2]
+
+    def test_complete_returns_view(self):
+        array = SortedArray(['ABC', 'ABD', 'A', 'XYZ'])
+        completions = array.complete('A')
+        assert isinstance(completions, SortedArrayView)
+        # Verify the view shares the array's list instead of copying it
+        assert completions.items is array.items
+        assert len(completions) == 3
+        assert completions[0] == 'A'
+        assert completions[-1] == 'ABD'
+        assert list(completions[1:]) == ['ABC', 'ABD']
+        assert isinstance(completions[1:], SortedArrayView)
+        assert completions[::2] == ['A', 'ABD']
+        assert 'ABC' in completions
+        assert 'XYZ' not in completions
+        with self.assertRaises(IndexError):
+            completions[3]
+
+    def test_view_equality(self):
+        array = SortedArray(['A', 'AB', 'B'])
+        assert array.complete('A') == ['A', 'AB']
+        assert array.complete('A') == ('A', 'AB')
+        assert array.complete('A') == array.complete('A')
+        assert array.complete('A') != ['A']
+        # Strings are sequences too but never equal to a view
+        assert array.complete('C') != ''
+        assert array.complete('A') != 'AAB'
+
+    def test_view_invalidated_by_insert(self):
+        array = SortedArray(['b', 'ba', 'c'])
+        completions = array.complete('b')
+        array.insert('a')
+        with self.assertRaises(RuntimeError):
+            list(completions)
+        with self.assertRaises(RuntimeError):
+            completions[0]
+        with self.assertRaises(RuntimeError):
+            len(completions)
+        # A repeated insert does not change the array or invalidate views
+        completions = array.complete('b')
+        array.insert('ba')
+        assert list(completions) == ['b', 'ba']
+
+    def test_view_invalidated_while_iterating(self):
+        array = SortedArray(['b', 'ba', 'c'])
+        iterator = iter(array.complete('b'))
+        assert next(iterator) == 'b'
+        array.insert('a')
+        with self.assertRaises(RuntimeError):
+            next(iterator)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!python3
+
+
+class TernarySearchTreeNode:
+    """TernarySearchTreeNode: A node for use in a ternary search tree that
+    stores a single character and three links to children nodes: a low child
+    for strings whose next character is smaller, an equal child for the next
+    character of strings that match this one, and a high child for strings
+    whose next character is larger."""
+
+    __slots__ = ('character', 'low', 'equal', 'high', 'terminal')
+
+    def __init__(self, character):
+        """Initialize this node with the given character value, no children
+        nodes, and a boolean terminal property."""
+        self.character = character
+        self.low = None
+        self.equal = None
+        self.high = None
+        # Marks if this node terminates a string in the ternary search tree
+        self.terminal = False
+
+    def is_terminal(self) -> bool:
+        """Return True if this node terminates a string."""
+        return self.terminal
+
+    def __repr__(self):
+        """Return a code representation of this node."""
+        return f'TernarySearchTreeNode({self.character!r})'
+
+
+class TernarySearchTree:
+    """TernarySearchTree: A prefix tree with the same methods as PrefixTree
+    where each node has only three children links, arranged as a binary search
+    tree of the characters that can follow a given prefix, instead of a
+    dictionary of all of them. Uses less memory per node than a dictionary of
+    children, especially for large alphabets such as Unicode, at the cost of
+    O(log k) comparisons to find one of k next characters. Strings are
+    retrieved in lexicographic order."""
+
+    def __init__(self, strings=None):
+        """Initialize this tree and insert the given strings, if any."""
+        self.root = None
+        # The empty string has no node to mark terminal so track it here
+        self.has_empty_string = False
+        # Count the number of complete words inserted into the tree
+        self.size = 0
+        # Insert each string, if any were given
+        if strings is not None:
+            for string in strings:
+                self.insert(string)
+
+    def __repr__(self):
+        """Return a string representation of this tree."""
+        return f'TernarySearchTree({self.strings()!r})'
+
+    def is_empty(self) -> bool:
+        """Return True if this tree is empty (contains no strings)."""
+        return self.size == 0
+
+    def contains(self, word: str) -> bool:
+        """Return True if this tree contains the given string."""
+        if len(word) == 0:
+            return self.has_empty_string
+        node = self._find_node(word)
+        return node is not None and node.terminal
+
+    def insert(self, word: str):
+        """Insert the given string into this tree."""
+        if len(word) == 0:
+            if not self.has_empty_string:
+                self.has_empty_string = True
+                self.size += 1
+            return
+        if self.root is None:
+            self.root = TernarySearchTreeNode(word[0])
+        node = self.root
+        index = 0
+        while True:
+            char = word[index]
+            if char < node.character:
+                if node.low is None:
+                    node.low = TernarySearchTreeNode(char)
+                node = node.low
+            elif char > node.character:
+                if node.high is None:
+                    node.high = TernarySearchTreeNode(char)
+                node = node.high
+            else:
+                index += 1
+                # case: this node matches the last character of the word
+                if index == len(word):
+                    break
+                if node.equal is None:
+                    node.equal = TernarySearchTreeNode(word[index])
+                node = node.equal
+        # case: node already exists & is a terminal
+        if node.terminal:
+            return
+        node.terminal = True
+        self.size += 1
+
+    def _find_node(self, word: str) -> TernarySearchTreeNode:
+        """Return the node that matches the last character of the given
+        non-empty string, or None if the given string is not found."""
+        node = self.root
+        index = 0
+        while node is not None:
+            char = word[index]
+            if char < node.character:
+                node = node.low
+            elif char > node.character:
+                node = node.high
+            else:
+                index += 1
+                if index == len(word):
+                    return node
+                node = node.equal
+        return None
+
+    def complete(self, word_or_prefix: str) -> [str]:
+        """Return a list of all strings stored in this tree that start with
+        the given prefix string."""
+        if len(word_or_prefix) == 0:
+            return self.strings()
+        completions = []
+        node = self._find_node(word_or_prefix)
+        # case: prefix does not exist
+        if node is None:
+            return completions
+        if node.terminal:
+            completions.append(word_or_prefix)
+        self._traverse(node.equal, word_or_prefix, completions.append)
+        return completions
+
+    def strings(self) -> [str]:
+        """Return a list of all strings stored in this tree."""
+        all_strings = []
+        if self.has_empty_string:
+            all_strings.append('')
+        self._traverse(self.root, '', all_strings.append)
+        return all_strings
+
+    def _traverse(self, node: TernarySearchTreeNode, prefix: str, visit):
+        """Traverse the subtree below the given node, whose strings all start
+        with the given prefix, with an iterative in-order traversal and visit
+        each string that terminates in it with the given function."""
+        if node is None:
+            return
+        # Stack items are a node to traverse with the prefix before it, or
+        # None with a completed string to visit, pushed in reverse order
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            if node is None:
+                visit(prefix)
+                continue
+            string = prefix + node.character
+            if node.high is not None:
+                stack.append((node.high, prefix))
+            if node.equal is not None:
+                stack.append((node.equal, string))
+            if node.terminal:
+                stack.append((None, string))
+            if node.low is not None:
+                stack.append((node.low, prefix))
@@ -0,0 +1,69 @@
+#!python3
+
+from ternarysearchtree import TernarySearchTree
+from prefixtree import PrefixTree
+import unittest
+
+
+class TernarySearchTreeTest(unittest.TestCase):
+
+    def test_init_and_properties(self):
+        tree = TernarySearchTree()
+        assert tree.size == 0
+        assert tree.is_empty() is True
+        assert tree.root is None
+        assert tree.strings() == []
+
+    def test_insert_links_low_equal_and_high(self):
+        tree = TernarySearchTree(['B'])
+        tree.insert('A')
+        tree.insert('C')
+        tree.insert('BD')
+        assert tree.root.character == 'B'
+        assert tree.root.is_terminal() is True
+        assert tree.root.low.character == 'A'
+        assert tree.root.high.character == 'C'
+        assert tree.root.equal.character == 'D'
+        assert tree.root.equal.is_terminal() is True
+        assert tree.size == 4
+
+    def test_size_with_repeated_insert(self):
+        tree = TernarySearchTree()
+        for string in ['A', 'A', 'ABC', 'ABC', 'ABD', 'XYZ', 'XYZ', '', '']:
+            tree.insert(string)
+        assert tree.size == 5
+
+    def test_contains(self):
+        tree = TernarySearchTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.contains('ABC') is True
+        assert tree.contains('ABD') is True
+        assert tree.contains('A') is True
+        assert tree.contains('XYZ') is True
+        assert tree.contains('AB') is False
+        assert tree.contains('BC') is False
+        assert tree.contains('XYZW') is False
+        assert tree.contains('') is False
+        tree.insert('')
+        assert tree.contains('') is True
+
+    def test_complete(self):
+        tree = TernarySearchTree(['ABC', 'ABD', 'A', 'XYZ'])
+        assert tree.complete('ABC') == ['ABC']
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        assert tree.complete('A') == ['A', 'ABC', 'ABD']
+        assert tree.complete('XY') == ['XYZ']
+        assert tree.complete('') == ['A', 'ABC', 'ABD', 'XYZ']
+        assert tree.complete('B') == []
+        assert tree.complete('XYZW') == []
+
+    def test_matches_prefix_tree(self):
+        strings = 'Shelly sells seashells by the sea shore naïve café'.split()
+        tree = TernarySearchTree(strings)
+        prefix_tree = PrefixTree(strings)
+        assert tree.strings() == sorted(set(strings))
+        for prefix in ['S', 's', 'se', 'sea', 'sh', 'b', 'caf', 'x']:
+            assert tree.complete(prefix) == sorted(prefix_tree.complete(prefix))
+
+
+if __name__ == '__main__':
+    unittest.main()